@@ -159,6 +159,7 @@ EOF
     # --- PARSER (Python) ---
     python3 - "$LOG_FILE" "$START_TIME" "$DEBUG" <<'END_PYTHON'
 import sys
+import functools
 import re
 import time
 import datetime
@@ -178,57 +179,305 @@ BOLD = '\033[1m'
 RESET = '\033[0m'
 DIM = '\033[2m'
 
+# --- PARSER PATTERNS (precompiled) ---
+_ANSI_RE = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
+_TIME_RE = re.compile(r'(\d{1,2})(:\d{2})?(am|pm)', re.IGNORECASE)
+_FULL_TIME_RE = re.compile(r'(?:([A-Za-z]{3})\s+(\d{1,2})\s+at\s+)?(\d{1,2}):(\d{2})(am|pm)', re.IGNORECASE)
+_DATE_PREFIX_RE = re.compile(r'([A-Za-z]{3})\s+(\d{1,2})\s+at', re.IGNORECASE)
+_DIGITS = frozenset('0123456789')
+_CRLF_RE = re.compile(r'\r\n?')
+
+# Fast-path parser for the canonical reset strings built by parse_reset_time
+_RESET_PARSE_RE = re.compile(
+    r'(?:(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec) (\d{1,2})(?: (\d{4}))? at )?'
+    r'(1[0-2]|0?[1-9])(?::([0-5]\d))?(am|pm)',
+    re.IGNORECASE
+)
+_MONTHS = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12,
+}
+# Tomorrow logic: how far in the past a time-only reset may be, and the step
+_RESET_GRACE = timedelta(minutes=15)
+_ONE_DAY = timedelta(days=1)
+# Year wrap: a yearless date further than this from now is next/last year's
+_YEAR_WRAP = timedelta(days=300)
+
+# Each section is "<header> ... X% used ... Resets <time>", searched one
+# step at a time (see _search_usage). "X% used" is common to both; it is
+# only tried at the start of a digit run (the lookahead lets re skip to
+# digits), so a long run of digits isn't re-scanned from every position
+_USED_RE = re.compile(r'(?=\d)(?<!\d)(\d+)%\s*used', re.IGNORECASE)
+
+# Session: "Current session" ... "X% used" ... "Rese(t)s <time>"
+# Handle potential character corruption (Reses vs Resets)
+_SESSION_STEPS = (
+    re.compile(r'Current\s+session', re.IGNORECASE),
+    _USED_RE,
+    re.compile(r'Rese[ts]*\s*(.*?)(?:\s{2,}|\n|$)', re.DOTALL | re.IGNORECASE),
+)
+
+# Week: "Current week (all models)" - must explicitly match "(all models)"
+# to avoid matching "Sonnet only" section
+_WEEK_STEPS = (
+    re.compile(r'Current\s+week\s+\(all\s+models\)', re.IGNORECASE),
+    _USED_RE,
+    re.compile(r'Resets\s*(.*?)(?:\s{2,}|\n|$)', re.DOTALL | re.IGNORECASE),
+)
+
+def _find_used(used_re, text, pos, end):
+    # Same match as used_re.search(text, pos, end) for the "N% used" step.
+    # Every match ends a digit run at a '%', so only the '%' signs are
+    # visited and the regex is tried once at the start of the digits before
+    # each, skipping the bar without running the regex at every character.
+    start = pos
+    percent = text.find('%', pos, end)
+    while percent >= 0:
+        # Digit runs never span a '%', so look back no further than start
+        digits = start + len(text[start:percent].rstrip('0123456789'))
+        # Other Unicode digits match \d too; walked one at a time (rare)
+        while digits > start and text[digits - 1].isdecimal():
+            digits -= 1
+        if digits < percent:
+            match = used_re.match(text, digits, end)
+            if match:
+                return match
+        start = percent + 1
+        percent = text.find('%', start, end)
+    return None
+
+def _search_usage(text, steps, end):
+    # (used, reset) for a section's (header, used, resets) steps in text[:end].
+    # Same as searching for "header.*?used.*?resets" with DOTALL, whose match
+    # takes the first header, the first "% used" after it and the first reset
+    # after that: finding each in turn is linear, where the single regex
+    # backtracks through every "% used" when no reset follows.
+    header_re, used_re, resets_re = steps
+    match = header_re.search(text, 0, end)
+    if match:
+        match = _find_used(used_re, text, match.end(), end)
+    if not match:
+        return None
+    used = match.group(1)
+    match = resets_re.search(text, match.end(), end)
+    if not match:
+        return None
+    return used, match.group(1)
+
 def strip_ansi(text):
-    return re.sub(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])', '', text)
+    # Fast path: most captured text has no escape sequences at all
+    if '\x1b' not in text:
+        return text
+    return _ANSI_RE.sub('', text)
 
 def clean_date_string(text):
-    text = re.sub(r'\s*\(.*?\)', '', text) # Remove (Europe/Stockholm)
-    text = text.replace(',', '')           # Remove commas
-    text = re.sub(r'\s+', ' ', text)       # Collapse spaces
-    text = ''.join(c for c in text if c.isprintable())
+    # Common case, no "(...)": commas, whitespace runs and the strip are
+    # C-level replace/split/join. Any whitespace splits, as in the scan below;
+    # a non-printable left inside a word needs the scan's exact placement
+    if '(' not in text:
+        t = text.replace(',', '')
+        clean = ' '.join(t.split())
+        if clean.isprintable():
+            # The scan uppercases am/pm before stripping, so not when it
+            # is followed by whitespace
+            if not t[-1:].isspace() and clean[-2:].lower() in ('am', 'pm'):
+                clean = clean[:-2] + clean[-2:].upper()
+            return clean
+
+    # One pass over the text, equivalent to: drop "\s*(...)" groups (no
+    # newline inside), drop commas, collapse whitespace runs to one space,
+    # drop non-printables, uppercase a trailing am/pm, strip
+    out = []
+    in_space = False   # Last kept char is a collapsed space
+    run = None         # (len(out), in_space) where the current whitespace run began
+    i = 0
+    n = len(text)
+    while i < n:
+        c = text[i]
+        if c.isspace():
+            if run is None:
+                run = (len(out), in_space)
+            if not in_space:
+                out.append(' ')
+                in_space = True
+        elif c == ',':
+            run = None
+        else:
+            if c == '(':
+                # Remove (Europe/Stockholm) with the whitespace before it
+                end = text.find(')', i + 1)
+                if end != -1 and text.find('\n', i + 1, end) == -1:
+                    if run is not None:
+                        del out[run[0]:]
+                        in_space = run[1]
+                    run = None
+                    i = end + 1
+                    continue
+            run = None
+            in_space = False
+            if c.isprintable():
+                out.append(c)
+        i += 1
+    text = ''.join(out)
     # Normalize am/pm to uppercase for consistent %p parsing
-    text = re.sub(r'(?i)(am|pm)$', lambda m: m.group(1).upper(), text)
+    if text[-2:].lower() in ('am', 'pm'):
+        text = text[:-2] + text[-2:].upper()
     return text.strip()
 
-def parse_reset_time(time_str, window_hours=5, section_text=None):
-    now = datetime.datetime.now()
-    time_pattern = r'(\d{1,2})(:\d{2})?(am|pm)'
-    time_match = None
+def _is_time_colon(text, k, end):
+    # Colon at k is that of an "H:MMam" time (see _FULL_TIME_RE)
+    return (0 < k and k + 5 <= end and text[k - 1].isdecimal()
+            and text[k + 1].isdecimal() and text[k + 2].isdecimal()
+            and text[k + 3:k + 5].lower() in ('am', 'pm'))
+
+def _last_full_time(text, end):
+    # Last _FULL_TIME_RE match in text[:end], found from the right
+    # Every match holds exactly one colon, that of its time, and every valid
+    # "H:MMam" is part of a match - so the last match holds the last one
+    k = text.rfind(':', 0, end)
+    while k != -1 and not _is_time_colon(text, k, end):
+        k = text.rfind(':', 0, k)
+    if k == -1:
+        return None
+    # The time takes two digits when there are two (leftmost match)
+    core = k - 2 if k >= 2 and text[k - 2].isdecimal() else k - 1
+    # Walk back over an optional "Mon DD at " prefix ending at the time
+    i = core
+    while i > 0 and text[i - 1].isspace():
+        i -= 1
+    if i < core and text[i - 2:i].lower() == 'at':
+        j = i - 2
+        while j > 0 and text[j - 1].isspace():
+            j -= 1
+        d = j
+        while d > j - 2 and d > 0 and text[d - 1].isdecimal():
+            d -= 1
+        w = d
+        while w > 0 and text[w - 1].isspace():
+            w -= 1
+        start = w - 3
+        if j < i - 2 and d < j and w < d and start >= 0:
+            # finditer can't start inside the previous match
+            q = text.rfind(':', max(0, start - 4), start)
+            if q == -1 or not _is_time_colon(text, q, end):
+                match = _FULL_TIME_RE.match(text, start, end)
+                if match and match.end() == k + 5:
+                    return match
+    return _FULL_TIME_RE.match(text, core, end)
+
+@functools.lru_cache(maxsize=256)
+def _reset_time_components(time_str, section_text, section_end):
+    fields = None  # (month, day, hour, ':MM' or '', ampm); no date -> month None
 
     # Check if time_str already has a date prefix (e.g., "Feb 5 at 6:59pm")
     # If so, trust it directly - don't search section_text which may find stray times
-    has_date_prefix = time_str and re.search(r'[A-Za-z]{3}\s+\d{1,2}\s+at', time_str, re.IGNORECASE)
+    date_match = time_str and _DATE_PREFIX_RE.search(time_str)
 
     # FALLBACK ONLY: Search section_text when time_str is corrupted or time-only.
     # Terminal rendering can corrupt the captured time_str with cursor movement,
     # partial updates, and double-spaces. Search the full section as backup.
-    if section_text and not has_date_prefix:
+    if section_text and not date_match:
         # Match time with optional date prefix: "12:59am" or "Jan 29 at 6:59pm"
-        full_time_pattern = r'(?:[A-Za-z]{3}\s+\d{1,2}\s+at\s+)?\d{1,2}:\d{2}(?:am|pm)'
-        all_matches = re.findall(full_time_pattern, section_text, re.IGNORECASE)
-        if all_matches:
-            time_str = all_matches[-1]  # Use the LAST match
-            time_match = re.search(time_pattern, time_str, re.IGNORECASE)
+        if section_end is None:
+            section_end = len(section_text)
+        last_match = _last_full_time(section_text, section_end)
+        if last_match:
+            # Its groups are the date prefix and the time: nothing to re-search
+            month, day, hour, minute, ampm = last_match.groups()
+            fields = (month, day, hour, ':' + minute, ampm)
 
     # PRIMARY: Try the captured time_str directly (now trusted if has date prefix)
-    if not time_match and time_str:
-        time_match = re.search(time_pattern, time_str, re.IGNORECASE)
+    if fields is None and time_str:
+        time_match = _TIME_RE.search(time_str)
+        if time_match:
+            # The date prefix search above was on this same string
+            month, day = date_match.groups() if date_match else (None, None)
+            fields = (month, day) + time_match.groups('')
 
     # If we found a time match, reconstruct time_str properly
-    if time_match:
-        hour = time_match.group(1)
-        minutes = time_match.group(2) or ''
-        ampm = time_match.group(3)
-
-        # Check for date prefix (e.g., "Jan 29 at") in original string
-        date_match = re.search(r'([A-Za-z]{3})\s+(\d{1,2})\s+at', time_str, re.IGNORECASE)
-        if date_match:
-            time_str = f"{date_match.group(1)} {date_match.group(2)} at {hour}{minutes}{ampm}"
+    if fields:
+        month, day, hour, minutes, ampm = fields
+        if month:
+            time_str = f"{month} {day} at {hour}{minutes}{ampm}"
         else:
             time_str = f"{hour}{minutes}{ampm}"
+            # Time-only: take the time straight from the captured groups.
+            # Values strptime would reject ("13pm", "6:75pm", digits other
+            # than ASCII, which \d also matches) go down the ladder.
+            if time_str.isascii():
+                h = int(hour)
+                m = int(minutes[1:]) if minutes else 0
+                if 1 <= h <= 12 and m < 60:
+                    h = h % 12 + (12 if ampm.upper() == 'PM' else 0)
+                    return time_str, datetime.time(h, m), None  # Already canonical, nothing to clean
 
     clean = clean_date_string(time_str)
+    # Fast path: the canonical date form built above ("Jan 29 at 6:59PM")
+    # is decoded with one match and a direct constructor, skipping the
+    # exception-driven strptime ladder in parse_reset_time. strptime only
+    # takes ASCII digits, so anything else is left to the ladder to reject
+    parts = clean.isascii() and _RESET_PARSE_RE.fullmatch(clean)
+    if not parts:
+        return clean, None, None
+    # Resolved to numbers here, so cache hits skip the month lookup too
+    month, day, year, hour, minute, ampm = parts.groups()
+    return clean, None, (
+        _MONTHS[month.lower()] if month else None,
+        int(day) if day else None,
+        int(year) if year else None,
+        int(hour) % 12 + (12 if ampm.upper() == 'PM' else 0),
+        int(minute) if minute else 0,
+    )
+
+@functools.lru_cache(maxsize=64)
+def _datetime(year, month, day, hour, minute):
+    # Shared datetime for the fast path; a cache hit beats the constructor
+    return datetime.datetime(year, month, day, hour, minute)
+
+def _next_reset(dt, now):
+    # The tomorrow logic for a time-only reset, dt being that time today.
+    # If we parsed "1:59am" but it is currently "11:58pm", the parsed date
+    # (Today 1:59am) is in the past. "Resets" always implies the future.
+    if dt < now - _RESET_GRACE:
+        # The next occurrence of a time-only reset is always tomorrow:
+        # dt is earlier today, so dt + 1 day is in the future and <24h
+        # away. That holds for weekly (168h) windows too - a time-only
+        # weekly reset is never more than a day out.
+        return dt + _ONE_DAY
+    return dt
+
+def parse_reset_time(time_str, window_hours=5, section_text=None, now=None, *, section_end=None):
+    # No time fits in under three characters or without a digit ("1pm" is
+    # the shortest), so skip cleaning and the format ladder for those. Only
+    # ASCII strings are judged by _DIGITS, as \d matches other digits too
+    if not section_text and (
+            not time_str or len(time_str) < 3
+            or (_DIGITS.isdisjoint(time_str) and time_str.isascii())):
+        return None
+
+    if now is None:
+        now = datetime.datetime.now()
+
+    # Everything up to the datetime depends only on the inputs, not on now
+    clean, time_only, parts = _reset_time_components(time_str, section_text, section_end)
+
+    if time_only is not None:
+        # Decoded time of day: no format ladder, only the tomorrow logic
+        return _next_reset(datetime.datetime.combine(now.date(), time_only), now)
+
     dt = None
+    has_year = False
+    if parts:
+        month, day, year, hour, minute = parts
+        try:
+            if month:
+                has_year = year is not None
+                dt = _datetime(year if has_year else now.year,
+                               month, day, hour, minute)
+            else:
+                dt = datetime.datetime.combine(now.date(), datetime.time(hour, minute))
+        except ValueError:
+            dt = None  # e.g. "Feb 30" - let the strptime ladder reject it
 
     # Formats containing a specific Date
     formats_date_with_year = [
@@ -249,82 +498,105 @@ def parse_reset_time(time_str, window_hours=5, section_text=None):
     # 1. Try formats with explicit Dates first
     if 'at' in clean:
         # First try formats that already have year embedded
-        for fmt in formats_date_with_year:
-            try:
-                dt = datetime.datetime.strptime(clean, fmt)
-                break
-            except ValueError:
-                continue
+        if dt is None:
+            for fmt in formats_date_with_year:
+                try:
+                    dt = datetime.datetime.strptime(clean, fmt)
+                    has_year = True
+                    break
+                except ValueError:
+                    continue
 
         # Then try formats without year (append current year)
         if dt is None:
             for fmt in formats_date_no_year:
                 try:
                     dt = datetime.datetime.strptime(f"{clean} {now.year}", f"{fmt} %Y")
-                    # Year Wrap Logic: If date is way in past, it's next year
-                    if dt < now - timedelta(days=300):
-                        dt = dt.replace(year=now.year + 1)
-                    elif dt > now + timedelta(days=300):
-                        dt = dt.replace(year=now.year - 1)
                     break
                 except ValueError:
                     continue
 
+        # Year Wrap Logic: If date is way in past, it's next year
+        if dt is not None and not has_year:
+            year = now.year
+            if dt < now - _YEAR_WRAP:
+                year += 1
+            elif dt > now + _YEAR_WRAP:
+                year -= 1
+            # Feb 29 has no counterpart in the wrapped year; keep it as parsed
+            if year != now.year and (dt.month, dt.day) != (2, 29):
+                dt = dt.replace(year=year)
+
     # 2. Try Time-Only formats
     else:
-        for fmt in formats_time:
-            try:
-                t = datetime.datetime.strptime(clean, fmt).time()
-                dt = datetime.datetime.combine(now.date(), t)
-
-                # --- FIX: THE TOMORROW LOGIC ---
-                # If we parsed "1:59am" but it is currently "11:58pm",
-                # the parsed date (Today 1:59am) is in the past.
-                # "Resets" always implies the future.
-                if dt < now - timedelta(minutes=15):
-                    if window_hours == 168:
-                        # WEEKLY RESET: Find next occurrence within 7 days
-                        # The reset happens on a specific weekday at this time.
-                        # We need to find the NEXT occurrence, not blindly add 7 days.
-                        # Try each day until we find a future time ≤168h away.
-                        for days in range(1, 8):
-                            candidate = dt + timedelta(days=days)
-                            remaining_hours = (candidate - now).total_seconds() / 3600
-                            if candidate > now and remaining_hours <= 168:
-                                dt = candidate
-                                break
-                    else:
-                        # SESSION RESET: Add 1 day for daily/session windows
-                        dt += timedelta(days=1)
-
-                break
-            except ValueError:
-                continue
+        if dt is None:
+            for fmt in formats_time:
+                try:
+                    t = datetime.datetime.strptime(clean, fmt).time()
+                    dt = datetime.datetime.combine(now.date(), t)
+                    break
+                except ValueError:
+                    continue
+
+        # --- FIX: THE TOMORROW LOGIC ---
+        if dt is not None:
+            dt = _next_reset(dt, now)
 
     return dt
 
-def validate_reset_time(reset_dt, window_hours, reset_str):
+@functools.lru_cache(maxsize=None)
+def _hours(n):
+    # timedelta of n hours, built once per window size
+    return timedelta(hours=n)
+
+def _consistency_warning(remain, window_hours, reset_str):
+    # Warning if remaining time falls outside 0..window_hours, else None.
+    # Compared as timedeltas; hours are only worked out for the messages
+    if remain < _hours(0):
+        remain_hours = remain.total_seconds() / 3600
+        return f"Inconsistent: '{reset_str}' → {remain_hours:.1f}h remaining (expected ≥0)"
+
+    if remain > _hours(window_hours):
+        remain_hours = remain.total_seconds() / 3600
+        return f"Inconsistent: '{reset_str}' → {remain_hours:.1f}h remaining (expected ≤{window_hours}h)"
+
+    return None
+
+
+def check_reset_time(reset_dt, window_hours, reset_str, now=None):
     """
-    Validate parsed reset time makes sense.
-    Returns (reset_dt, warning_msg) - dt may be None if invalid.
+    Validate and cross-validate a parsed reset time in one pass.
+    Returns (reset_dt, warning_msg, cross_warning) - dt may be None if invalid.
     """
     if not reset_dt:
-        return None, f"Failed to parse: '{reset_str}'"
+        return None, f"Failed to parse: '{reset_str}'", None
 
-    now = datetime.datetime.now()
+    if now is None:
+        now = datetime.datetime.now()
+
+    # Compared as timedeltas; hours are only worked out for the messages
     remain = reset_dt - now
-    remain_hours = remain.total_seconds() / 3600
-    max_hours = window_hours + 1  # Small buffer for timing
 
     # Sanity check: time remaining can't exceed window
-    if remain_hours > max_hours:
-        return None, f"Invalid: {remain_hours:.1f}h remaining exceeds {window_hours}h window"
+    if remain > _hours(window_hours + 1):  # Small buffer for timing
+        remain_hours = remain.total_seconds() / 3600
+        return None, f"Invalid: {remain_hours:.1f}h remaining exceeds {window_hours}h window", None
 
     # Sanity check: time remaining shouldn't be very negative
-    if remain_hours < -window_hours:
-        return None, f"Invalid: reset time {remain_hours:.1f}h in past"
+    if remain < _hours(-window_hours):
+        remain_hours = remain.total_seconds() / 3600
+        return None, f"Invalid: reset time {remain_hours:.1f}h in past", None
 
-    return reset_dt, None
+    return reset_dt, None, _consistency_warning(remain, window_hours, reset_str)
+
+
+def validate_reset_time(reset_dt, window_hours, reset_str, now=None):
+    """
+    Validate parsed reset time makes sense.
+    Returns (reset_dt, warning_msg) - dt may be None if invalid.
+    """
+    reset_dt, warning, _ = check_reset_time(reset_dt, window_hours, reset_str, now)
+    return reset_dt, warning
 
 
 def cross_validate_reset(reset_dt, window_hours, reset_str, now=None):
@@ -342,17 +614,7 @@ def cross_validate_reset(reset_dt, window_hours, reset_str, now=None):
     if now is None:
         now = datetime.datetime.now()
 
-    remain = reset_dt - now
-    remain_hours = remain.total_seconds() / 3600
-
-    # Check bounds based on window type
-    if remain_hours < 0:
-        return f"Inconsistent: '{reset_str}' → {remain_hours:.1f}h remaining (expected ≥0)"
-
-    if remain_hours > window_hours:
-        return f"Inconsistent: '{reset_str}' → {remain_hours:.1f}h remaining (expected ≤{window_hours}h)"
-
-    return None
+    return _consistency_warning(reset_dt - now, window_hours, reset_str)
 
 def create_bar(percent):
     p = max(0, min(100, percent))
@@ -363,26 +625,18 @@ try:
     with open(log_path, 'r', encoding='utf-8', errors='ignore') as f:
         content = f.read()
 
-    content = content.replace('\r\n', '\n').replace('\r', '\n')
+    if '\r' in content:
+        content = _CRLF_RE.sub('\n', content)
     clean_text = strip_ansi(content)
 
     # --- REGEX PATTERNS ---
-    # Split content at "Current week" to isolate session section
-    session_section = clean_text.split('Current week')[0] if 'Current week' in clean_text else clean_text
-
-    # Session: "Current session" ... "X% used" ... "Rese(t)s <time>"
-    # Handle potential character corruption (Reses vs Resets)
-    session_match = re.search(
-        r'Current\s+session.*?(\d+)%\s*used.*?Rese[ts]*\s*(.*?)(?:\s{2,}|\n|$)',
-        session_section, re.DOTALL | re.IGNORECASE
-    )
+    # Session section ends at the first "Current week" (searched via endpos)
+    session_end = clean_text.find('Current week')
+    if session_end < 0:
+        session_end = len(clean_text)
 
-    # Week: "Current week (all models)" - must explicitly match "(all models)"
-    # to avoid matching "Sonnet only" section
-    week_match = re.search(
-        r'Current\s+week\s+\(all\s+models\).*?(\d+)%\s*used.*?Resets\s*(.*?)(?:\s{2,}|\n|$)',
-        clean_text, re.DOTALL | re.IGNORECASE
-    )
+    session_match = _search_usage(clean_text, _SESSION_STEPS, session_end)
+    week_match = _search_usage(clean_text, _WEEK_STEPS, len(clean_text))
 
     if not session_match or not week_match:
         print(f"{RED}Error: Data incomplete.{RESET}")
@@ -402,16 +656,17 @@ try:
             print(f"\n{DIM}Log file preserved at: {log_path}{RESET}")
         sys.exit(1)
 
+    session_used, session_reset = session_match
+    week_used, week_reset = week_match
+
     now = datetime.datetime.now()
     duration = time.time() - start_ts
 
-    def process_and_print(title, used_str, reset_str, window_hours, section_text=None):
+    def process_and_print(title, used_str, reset_str, window_hours, section_text=None, section_end=None):
         used = int(used_str)
-        reset_dt = parse_reset_time(reset_str, window_hours, section_text)
-        reset_dt, warning = validate_reset_time(reset_dt, window_hours, reset_str)
-
-        # Cross-validate consistency
-        cross_warning = cross_validate_reset(reset_dt, window_hours, reset_str, now)
+        reset_dt = parse_reset_time(reset_str, window_hours, section_text, section_end=section_end, now=now)
+        # Validate and cross-validate consistency in one pass
+        reset_dt, warning, cross_warning = check_reset_time(reset_dt, window_hours, reset_str, now)
 
         print(f"  {BOLD}{title}{RESET}")
 
@@ -422,7 +677,7 @@ try:
                 print(f"  {DIM}Raw reset_str: '{reset_str}'{RESET}")
                 if reset_dt is None:
                     # Try parsing again just to show what we got
-                    parsed_attempt = parse_reset_time(reset_str, window_hours, section_text)
+                    parsed_attempt = parse_reset_time(reset_str, window_hours, section_text, section_end=section_end)
                     if parsed_attempt:
                         print(f"  {DIM}Parsed datetime: {parsed_attempt}{RESET}")
                         print(f"  {DIM}Expected range: now to +{window_hours}h{RESET}")
@@ -433,10 +688,7 @@ try:
             print(f"  {RED}Warning: {cross_warning}{RESET}")
             return
 
-        if window_hours == 168:
-            start_dt = reset_dt - timedelta(days=7)
-        else:
-            start_dt = reset_dt - timedelta(hours=window_hours)
+        start_dt = reset_dt - _hours(window_hours)
 
         elapsed_pct = ((now - start_dt).total_seconds() / (window_hours * 3600)) * 100
         pace = used - elapsed_pct
@@ -471,17 +723,17 @@ try:
     print(f"\n{BOLD}Usage Analysis - {now.strftime('%A %B %d at %H:%M')} (took {duration:.2f}s){RESET}\n")
 
     # Always capture raw strings for diagnostic purposes
-    raw_session_str = session_match.group(2).strip()
-    raw_week_str = week_match.group(2).strip()
+    raw_session_str = session_reset.strip()
+    raw_week_str = week_reset.strip()
 
     if debug_mode:
         print(f"  {DIM}DEBUG: Session reset_str = '{raw_session_str}'{RESET}")
         print(f"  {DIM}DEBUG: Week reset_str = '{raw_week_str}'{RESET}")
         print()
 
-    process_and_print("Weekly Usage (168h)", week_match.group(1), raw_week_str, 168, clean_text)
+    process_and_print("Weekly Usage (168h)", week_used, raw_week_str, 168, clean_text)
     print(f"\n  {DIM}---{RESET}\n")
-    process_and_print("Session Usage (5h)", session_match.group(1), raw_session_str, 5, session_section)
+    process_and_print("Session Usage (5h)", session_used, raw_session_str, 5, clean_text, session_end)
 
     # Always show raw captured strings in dim text for post-hoc diagnosis
     print(f"\n  {DIM}Raw: week='{raw_week_str}' session='{raw_session_str}'{RESET}")
@@ -2,13 +2,22 @@
 Pytest configuration and fixtures for cc_usage.sh self-healing tests.
 """
 
-import json
+import os
+import functools
 import pytest
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 from dataclasses import dataclass
 import datetime
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:  # orjson is optional; stdlib json also accepts bytes
+    import json
+    _json_loads = json.loads
+
 
 # Project paths
 PROJECT_ROOT = Path(__file__).parent.parent
@@ -18,64 +27,73 @@ CAPTURED_DIR = FIXTURES_DIR / "captured"
 GENERATED_DIR = FIXTURES_DIR / "generated"
 QUARANTINE_DIR = FIXTURES_DIR / "quarantine"
 
+# Thread pool used by discover_fixtures once there are enough files to load
+_LOAD_WORKERS = 8
+_PARALLEL_LOAD_MIN = 32
+
+# Fixture source keyed by directory
+_SOURCE_BY_DIR = {
+    GOLDEN_DIR: "golden",
+    CAPTURED_DIR: "captured",
+    GENERATED_DIR: "generated",
+    QUARANTINE_DIR: "quarantine",
+}
+
 
-@dataclass
+@dataclass(frozen=True)
 class TestFixture:
     """A test fixture with input and expected output."""
+    __test__ = False  # Not a test class, despite the name
+
+    # Spelled out rather than slots=True, which needs Python 3.10
+    __slots__ = (
+        "name", "content", "expected", "source", "path",
+        # Derived in __post_init__
+        "expected_session_percent",  # Optional[int]
+        "expected_week_percent",     # Optional[int]
+        "expected_session_reset",    # Optional[str]
+        "expected_week_reset",       # Optional[str]
+        "should_fail",               # bool: expected to fail parsing
+    )
+
     name: str
     content: str
     expected: Dict[str, Any]
     source: str  # "golden", "captured", "generated", "quarantine"
     path: Path
 
-    @property
-    def expected_session_percent(self) -> Optional[int]:
-        return self.expected.get("session_percent")
-
-    @property
-    def expected_week_percent(self) -> Optional[int]:
-        return self.expected.get("week_percent")
-
-    @property
-    def expected_session_reset(self) -> Optional[str]:
-        return self.expected.get("session_reset_str")
-
-    @property
-    def expected_week_reset(self) -> Optional[str]:
-        return self.expected.get("week_reset_str")
-
-    @property
-    def should_fail(self) -> bool:
-        """Whether this fixture is expected to fail parsing."""
-        return self.expected.get("should_fail", False)
+    def __post_init__(self):
+        # Unpack the expected values once. They live in __slots__ but are not
+        # dataclass fields, and the instance is frozen, so set them directly.
+        expected = self.expected
+        set_field = object.__setattr__
+        set_field(self, "expected_session_percent", expected.get("session_percent"))
+        set_field(self, "expected_week_percent", expected.get("week_percent"))
+        set_field(self, "expected_session_reset", expected.get("session_reset_str"))
+        set_field(self, "expected_week_reset", expected.get("week_reset_str"))
+        set_field(self, "should_fail", expected.get("should_fail", False))
 
 
 def load_fixture(txt_path: Path) -> Optional[TestFixture]:
     """Load a fixture from a .txt file and its corresponding .expected.json."""
-    if not txt_path.exists():
-        return None
-
     json_path = txt_path.with_suffix('.expected.json')
-    if not json_path.exists():
+    try:
+        expected = _json_loads(json_path.read_bytes())
+    except FileNotFoundError:
         # No expected output defined
         return None
 
-    with open(txt_path, 'r', encoding='utf-8', errors='ignore') as f:
-        content = f.read()
-
-    with open(json_path, 'r') as f:
-        expected = json.load(f)
+    try:
+        content = txt_path.read_text(encoding='utf-8', errors='ignore')
+    except FileNotFoundError:
+        return None
 
-    # Determine source from path
+    # Determine source from the nearest known fixture directory
     source = "unknown"
-    if GOLDEN_DIR in txt_path.parents or txt_path.parent == GOLDEN_DIR:
-        source = "golden"
-    elif CAPTURED_DIR in txt_path.parents or txt_path.parent == CAPTURED_DIR:
-        source = "captured"
-    elif GENERATED_DIR in txt_path.parents or txt_path.parent == GENERATED_DIR:
-        source = "generated"
-    elif QUARANTINE_DIR in txt_path.parents or txt_path.parent == QUARANTINE_DIR:
-        source = "quarantine"
+    for parent in txt_path.parents:
+        if parent in _SOURCE_BY_DIR:
+            source = _SOURCE_BY_DIR[parent]
+            break
 
     return TestFixture(
         name=txt_path.stem,
@@ -86,29 +104,44 @@ def load_fixture(txt_path: Path) -> Optional[TestFixture]:
     )
 
 
+@functools.lru_cache(maxsize=4)
 def discover_fixtures(include_quarantine: bool = False) -> List[TestFixture]:
-    """Discover all test fixtures."""
-    fixtures = []
+    """
+    Discover all test fixtures.
 
+    Results are cached for the session; callers must not mutate the list.
+    """
     dirs = [GOLDEN_DIR, CAPTURED_DIR, GENERATED_DIR]
     if include_quarantine:
         dirs.append(QUARANTINE_DIR)
 
+    txt_paths = []
     for fixtures_dir in dirs:
-        if not fixtures_dir.exists():
+        try:
+            entries = os.scandir(fixtures_dir)
+        except FileNotFoundError:
             continue
-        for txt_path in fixtures_dir.glob("*.txt"):
-            fixture = load_fixture(txt_path)
-            if fixture:
-                fixtures.append(fixture)
+        # scandir yields names and file types from the directory read itself
+        with entries:
+            for entry in entries:
+                if entry.name.endswith(".txt") and entry.is_file():
+                    txt_paths.append(Path(entry.path))
 
-    return fixtures
+    # Loading is I/O bound and load_fixture shares no state, so overlap the
+    # reads on larger fixture sets (the GIL is released during file I/O)
+    if len(txt_paths) < _PARALLEL_LOAD_MIN:
+        loaded = map(load_fixture, txt_paths)
+    else:
+        with ThreadPoolExecutor(max_workers=_LOAD_WORKERS) as executor:
+            loaded = list(executor.map(load_fixture, txt_paths))
+
+    return [fixture for fixture in loaded if fixture]
 
 
 @pytest.fixture
 def all_fixtures() -> List[TestFixture]:
     """All discovered test fixtures (excluding quarantine)."""
-    return discover_fixtures(include_quarantine=False)
+    return list(discover_fixtures(include_quarantine=False))
 
 
 @pytest.fixture
@@ -117,12 +150,6 @@ def golden_fixtures() -> List[TestFixture]:
     return [f for f in discover_fixtures() if f.source == "golden"]
 
 
-@pytest.fixture(params=discover_fixtures())
-def fixture(request) -> TestFixture:
-    """Parameterized fixture for running tests against all fixtures."""
-    return request.param
-
-
 @pytest.fixture
 def mock_now():
     """
@@ -160,6 +187,12 @@ Sonnet only
 
 
 # Custom pytest hooks for JSON reporting
+def pytest_generate_tests(metafunc):
+    """Parameterize the `fixture` argument over all discovered fixtures."""
+    if "fixture" in metafunc.fixturenames:
+        metafunc.parametrize("fixture", discover_fixtures(), ids=lambda f: f.name)
+
+
 def pytest_configure(config):
     """Configure custom markers."""
     config.addinivalue_line(
@@ -169,11 +202,15 @@ def pytest_configure(config):
 
 def pytest_collection_modifyitems(config, items):
     """Skip quarantine fixtures unless explicitly requested."""
-    if not config.getoption("--include-quarantine", default=False):
-        skip_quarantine = pytest.mark.skip(reason="Fixture in quarantine")
-        for item in items:
-            if "quarantine" in str(item.fspath):
-                item.add_marker(skip_quarantine)
+    if config.getoption("--include-quarantine", default=False):
+        return
+    if not QUARANTINE_DIR.exists():
+        return
+
+    skip_quarantine = pytest.mark.skip(reason="Fixture in quarantine")
+    for item in items:
+        if QUARANTINE_DIR in item.path.parents:
+            item.add_marker(skip_quarantine)
 
 
 def pytest_addoption(parser):
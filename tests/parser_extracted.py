@@ -6,14 +6,68 @@ Python code in cc_usage.sh (lines 160-437). It provides testable functions
 for ANSI stripping, date parsing, and usage extraction.
 """
 
+import functools
 import re
+import sys
 import datetime
 from datetime import timedelta
-from typing import Optional, Tuple
-from dataclasses import dataclass
-
-
-@dataclass
+from typing import Any, Dict, Optional, Tuple
+from dataclasses import dataclass, field
+
+
+# Precompiled patterns (avoid per-call regex cache lookups)
+_ANSI_RE = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
+_TIME_RE = re.compile(r'(\d{1,2})(:\d{2})?(am|pm)', re.IGNORECASE)
+_FULL_TIME_RE = re.compile(r'(?:([A-Za-z]{3})\s+(\d{1,2})\s+at\s+)?(\d{1,2}):(\d{2})(am|pm)', re.IGNORECASE)
+_DATE_PREFIX_RE = re.compile(r'([A-Za-z]{3})\s+(\d{1,2})\s+at', re.IGNORECASE)
+_DIGITS = frozenset('0123456789')
+_CRLF_RE = re.compile(r'\r\n?')
+
+# Fast-path parser for the canonical reset strings built by parse_reset_time
+_RESET_PARSE_RE = re.compile(
+    r'(?:(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec) (\d{1,2})(?: (\d{4}))? at )?'
+    r'(1[0-2]|0?[1-9])(?::([0-5]\d))?(am|pm)',
+    re.IGNORECASE
+)
+_MONTHS = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12,
+}
+# Tomorrow logic: how far in the past a time-only reset may be, and the step
+_RESET_GRACE = timedelta(minutes=15)
+_ONE_DAY = timedelta(days=1)
+# Year wrap: a yearless date further than this from now is next/last year's
+_YEAR_WRAP = timedelta(days=300)
+
+# Each section is "<header> ... X% used ... Resets <time>", searched one
+# step at a time (see _search_usage). "X% used" is common to both; it is
+# only tried at the start of a digit run (the lookahead lets re skip to
+# digits), so a long run of digits isn't re-scanned from every position
+_USED_RE = re.compile(r'(?=\d)(?<!\d)(\d+)%\s*used', re.IGNORECASE)
+
+# Session: "Current session" ... "X% used" ... "Rese(t)s <time>"
+# Handle potential character corruption (Reses vs Resets)
+_SESSION_STEPS = (
+    re.compile(r'Current\s+session', re.IGNORECASE),
+    _USED_RE,
+    re.compile(r'Rese[ts]*\s*(.*?)(?:\s{2,}|\n|$)', re.DOTALL | re.IGNORECASE),
+)
+
+# Week: "Current week (all models)" - must explicitly match "(all models)"
+# to avoid matching "Sonnet only" section
+_WEEK_STEPS = (
+    re.compile(r'Current\s+week\s+\(all\s+models\)', re.IGNORECASE),
+    _USED_RE,
+    re.compile(r'Resets\s*(.*?)(?:\s{2,}|\n|$)', re.DOTALL | re.IGNORECASE),
+)
+
+# ParseResult uses __slots__ where dataclass supports it (3.10+)
+_DATACLASS_SLOTS: Dict[str, Any] = (
+    {"slots": True} if sys.version_info >= (3, 10) else {}
+)
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class ParseResult:
     """Result of parsing usage output."""
     session_percent: Optional[int] = None
@@ -23,11 +77,7 @@ class ParseResult:
     week_reset_str: Optional[str] = None
     week_reset_dt: Optional[datetime.datetime] = None
     error: Optional[str] = None
-    warnings: list = None
-
-    def __post_init__(self):
-        if self.warnings is None:
-            self.warnings = []
+    warnings: list = field(default_factory=list)
 
 
 def strip_ansi(text: str) -> str:
@@ -39,7 +89,10 @@ def strip_ansi(text: str) -> str:
     - OSC sequences: ESC ] ... BEL/ST
     - Simple escapes: ESC followed by single char
     """
-    return re.sub(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])', '', text)
+    # Fast path: most captured text has no escape sequences at all
+    if '\x1b' not in text:
+        return text
+    return _ANSI_RE.sub('', text)
 
 
 def clean_date_string(text: str) -> str:
@@ -53,73 +106,261 @@ def clean_date_string(text: str) -> str:
     - Strip non-printable characters
     - Normalize am/pm to uppercase
     """
-    text = re.sub(r'\s*\(.*?\)', '', text)  # Remove (Europe/Stockholm)
-    text = text.replace(',', '')             # Remove commas
-    text = re.sub(r'\s+', ' ', text)         # Collapse spaces
-    text = ''.join(c for c in text if c.isprintable())
+    # Common case, no "(...)": commas, whitespace runs and the strip are
+    # C-level replace/split/join. Any whitespace splits, as in the scan below;
+    # a non-printable left inside a word needs the scan's exact placement
+    if '(' not in text:
+        t = text.replace(',', '')
+        clean = ' '.join(t.split())
+        if clean.isprintable():
+            # The scan uppercases am/pm before stripping, so not when it
+            # is followed by whitespace
+            if not t[-1:].isspace() and clean[-2:].lower() in ('am', 'pm'):
+                clean = clean[:-2] + clean[-2:].upper()
+            return clean
+
+    # One pass over the text, equivalent to: drop "\s*(...)" groups (no
+    # newline inside), drop commas, collapse whitespace runs to one space,
+    # drop non-printables, uppercase a trailing am/pm, strip
+    out = []
+    in_space = False   # Last kept char is a collapsed space
+    run = None         # (len(out), in_space) where the current whitespace run began
+    i = 0
+    n = len(text)
+    while i < n:
+        c = text[i]
+        if c.isspace():
+            if run is None:
+                run = (len(out), in_space)
+            if not in_space:
+                out.append(' ')
+                in_space = True
+        elif c == ',':
+            run = None
+        else:
+            if c == '(':
+                # Remove (Europe/Stockholm) with the whitespace before it
+                end = text.find(')', i + 1)
+                if end != -1 and text.find('\n', i + 1, end) == -1:
+                    if run is not None:
+                        del out[run[0]:]
+                        in_space = run[1]
+                    run = None
+                    i = end + 1
+                    continue
+            run = None
+            in_space = False
+            if c.isprintable():
+                out.append(c)
+        i += 1
+    text = ''.join(out)
     # Normalize am/pm to uppercase for consistent %p parsing
-    text = re.sub(r'(?i)(am|pm)$', lambda m: m.group(1).upper(), text)
+    if text[-2:].lower() in ('am', 'pm'):
+        text = text[:-2] + text[-2:].upper()
     return text.strip()
 
 
-def parse_reset_time(
+def _is_time_colon(text: str, k: int, end: int) -> bool:
+    """Whether the colon at k is that of an "H:MMam" time (see _FULL_TIME_RE)."""
+    return (0 < k and k + 5 <= end and text[k - 1].isdecimal()
+            and text[k + 1].isdecimal() and text[k + 2].isdecimal()
+            and text[k + 3:k + 5].lower() in ('am', 'pm'))
+
+
+def _last_full_time(text: str, end: int) -> Optional[re.Match]:
+    """
+    Last _FULL_TIME_RE match in text[:end], found from the right.
+
+    Same result as the last match of finditer, without running the
+    regex over the whole section: times are located by their colon.
+    """
+    # Every match holds exactly one colon, that of its time, and every valid
+    # "H:MMam" is part of a match - so the last match holds the last one
+    k = text.rfind(':', 0, end)
+    while k != -1 and not _is_time_colon(text, k, end):
+        k = text.rfind(':', 0, k)
+    if k == -1:
+        return None
+    # The time takes two digits when there are two (leftmost match)
+    core = k - 2 if k >= 2 and text[k - 2].isdecimal() else k - 1
+    # Walk back over an optional "Mon DD at " prefix ending at the time
+    i = core
+    while i > 0 and text[i - 1].isspace():
+        i -= 1
+    if i < core and text[i - 2:i].lower() == 'at':
+        j = i - 2
+        while j > 0 and text[j - 1].isspace():
+            j -= 1
+        d = j
+        while d > j - 2 and d > 0 and text[d - 1].isdecimal():
+            d -= 1
+        w = d
+        while w > 0 and text[w - 1].isspace():
+            w -= 1
+        start = w - 3
+        if j < i - 2 and d < j and w < d and start >= 0:
+            # finditer can't start inside the previous match
+            q = text.rfind(':', max(0, start - 4), start)
+            if q == -1 or not _is_time_colon(text, q, end):
+                match = _FULL_TIME_RE.match(text, start, end)
+                if match and match.end() == k + 5:
+                    return match
+    return _FULL_TIME_RE.match(text, core, end)
+
+
+@functools.lru_cache(maxsize=256)
+def _reset_time_components(
     time_str: str,
-    window_hours: int = 5,
-    section_text: Optional[str] = None,
-    now: Optional[datetime.datetime] = None
-) -> Optional[datetime.datetime]:
+    section_text: Optional[str],
+    section_end: Optional[int]
+) -> Tuple[str, Optional[datetime.time], Optional[Tuple[Optional[int], ...]]]:
     """
-    Parse a reset time string into a datetime object.
+    Reduce a reset time string to the parts that don't depend on now.
 
-    Args:
-        time_str: The time string to parse (e.g., "6:59pm", "Jan 29 at 6:59pm")
-        window_hours: The window duration (5 for session, 168 for week)
-        section_text: Full section text to search for time patterns (more reliable)
-        now: Current datetime (for testing, defaults to datetime.now())
+    Cached, as the same reset strings are parsed over and over.
 
     Returns:
-        Parsed datetime or None if parsing fails
+        (clean, time_only, parts): the cleaned string, the time of day for
+        a valid time-only string, and the canonical fast-path fields as
+        (month, day, year, hour, minute) numbers, the date ones None if absent
     """
-    if now is None:
-        now = datetime.datetime.now()
-
-    time_pattern = r'(\d{1,2})(:\d{2})?(am|pm)'
-    time_match = None
+    fields = None  # (month, day, hour, ':MM' or '', ampm); no date -> month None
 
     # Check if time_str already has a date prefix (e.g., "Feb 5 at 6:59pm")
     # If so, trust it directly - don't search section_text which may find stray times
-    has_date_prefix = time_str and re.search(r'[A-Za-z]{3}\s+\d{1,2}\s+at', time_str, re.IGNORECASE)
+    date_match = time_str and _DATE_PREFIX_RE.search(time_str)
 
     # FALLBACK ONLY: Search section_text when time_str is corrupted or time-only.
     # Terminal rendering can corrupt the captured time_str with cursor movement,
     # partial updates, and double-spaces. Search the full section as backup.
-    if section_text and not has_date_prefix:
+    if section_text and not date_match:
         # Match time with optional date prefix: "12:59am" or "Jan 29 at 6:59pm"
-        full_time_pattern = r'(?:[A-Za-z]{3}\s+\d{1,2}\s+at\s+)?\d{1,2}:\d{2}(?:am|pm)'
-        all_matches = re.findall(full_time_pattern, section_text, re.IGNORECASE)
-        if all_matches:
-            time_str = all_matches[-1]  # Use the LAST match
-            time_match = re.search(time_pattern, time_str, re.IGNORECASE)
+        if section_end is None:
+            section_end = len(section_text)
+        last_match = _last_full_time(section_text, section_end)
+        if last_match:
+            # Its groups are the date prefix and the time: nothing to re-search
+            month, day, hour, minute, ampm = last_match.groups()
+            fields = (month, day, hour, ':' + minute, ampm)
 
     # PRIMARY: Try the captured time_str directly (now trusted if has date prefix)
-    if not time_match and time_str:
-        time_match = re.search(time_pattern, time_str, re.IGNORECASE)
+    if fields is None and time_str:
+        time_match = _TIME_RE.search(time_str)
+        if time_match:
+            # The date prefix search above was on this same string
+            month, day = date_match.groups() if date_match else (None, None)
+            fields = (month, day) + time_match.groups('')
 
     # If we found a time match, reconstruct time_str properly
-    if time_match:
-        hour = time_match.group(1)
-        minutes = time_match.group(2) or ''
-        ampm = time_match.group(3)
-
-        # Check for date prefix (e.g., "Jan 29 at") in original string
-        date_match = re.search(r'([A-Za-z]{3})\s+(\d{1,2})\s+at', time_str, re.IGNORECASE)
-        if date_match:
-            time_str = f"{date_match.group(1)} {date_match.group(2)} at {hour}{minutes}{ampm}"
+    if fields:
+        month, day, hour, minutes, ampm = fields
+        if month:
+            time_str = f"{month} {day} at {hour}{minutes}{ampm}"
         else:
             time_str = f"{hour}{minutes}{ampm}"
+            # Time-only: take the time straight from the captured groups.
+            # Values strptime would reject ("13pm", "6:75pm", digits other
+            # than ASCII, which \d also matches) go down the ladder.
+            if time_str.isascii():
+                h = int(hour)
+                m = int(minutes[1:]) if minutes else 0
+                if 1 <= h <= 12 and m < 60:
+                    h = h % 12 + (12 if ampm.upper() == 'PM' else 0)
+                    return time_str, datetime.time(h, m), None  # Already canonical, nothing to clean
 
     clean = clean_date_string(time_str)
+    # Fast path: the canonical date form built above ("Jan 29 at 6:59PM")
+    # is decoded with one match and a direct constructor, skipping the
+    # exception-driven strptime ladder in parse_reset_time. strptime only
+    # takes ASCII digits, so anything else is left to the ladder to reject
+    parts = clean.isascii() and _RESET_PARSE_RE.fullmatch(clean)
+    if not parts:
+        return clean, None, None
+    # Resolved to numbers here, so cache hits skip the month lookup too
+    month, day, year, hour, minute, ampm = parts.groups()
+    return clean, None, (
+        _MONTHS[month.lower()] if month else None,
+        int(day) if day else None,
+        int(year) if year else None,
+        int(hour) % 12 + (12 if ampm.upper() == 'PM' else 0),
+        int(minute) if minute else 0,
+    )
+
+
+@functools.lru_cache(maxsize=64)
+def _datetime(year: int, month: int, day: int, hour: int, minute: int) -> datetime.datetime:
+    """Shared datetime for the fast path; a cache hit beats the constructor."""
+    return datetime.datetime(year, month, day, hour, minute)
+
+
+def _next_reset(dt: datetime.datetime, now: datetime.datetime) -> datetime.datetime:
+    """
+    The tomorrow logic for a time-only reset, dt being that time today.
+
+    If we parsed "1:59am" but it is currently "11:58pm", the parsed date
+    (Today 1:59am) is in the past. "Resets" always implies the future.
+    """
+    if dt < now - _RESET_GRACE:
+        # The next occurrence of a time-only reset is always tomorrow:
+        # dt is earlier today, so dt + 1 day is in the future and <24h
+        # away. That holds for weekly (168h) windows too - a time-only
+        # weekly reset is never more than a day out.
+        return dt + _ONE_DAY
+    return dt
+
+
+def parse_reset_time(
+    time_str: str,
+    window_hours: int = 5,
+    section_text: Optional[str] = None,
+    now: Optional[datetime.datetime] = None,
+    *,
+    section_end: Optional[int] = None
+) -> Optional[datetime.datetime]:
+    """
+    Parse a reset time string into a datetime object.
+
+    Args:
+        time_str: The time string to parse (e.g., "6:59pm", "Jan 29 at 6:59pm")
+        window_hours: The window duration (5 for session, 168 for week)
+        section_text: Full section text to search for time patterns (more reliable)
+        now: Current datetime (for testing, defaults to datetime.now())
+        section_end: Only search section_text up to this index (avoids slicing)
+
+    Returns:
+        Parsed datetime or None if parsing fails
+    """
+    # No time fits in under three characters or without a digit ("1pm" is
+    # the shortest), so skip cleaning and the format ladder for those. Only
+    # ASCII strings are judged by _DIGITS, as \d matches other digits too
+    if not section_text and (
+            not time_str or len(time_str) < 3
+            or (_DIGITS.isdisjoint(time_str) and time_str.isascii())):
+        return None
+
+    if now is None:
+        now = datetime.datetime.now()
+
+    # Everything up to the datetime depends only on the inputs, not on now
+    clean, time_only, parts = _reset_time_components(time_str, section_text, section_end)
+
+    if time_only is not None:
+        # Decoded time of day: no format ladder, only the tomorrow logic
+        return _next_reset(datetime.datetime.combine(now.date(), time_only), now)
+
     dt = None
+    has_year = False
+    if parts:
+        month, day, year, hour, minute = parts
+        try:
+            if month:
+                has_year = year is not None
+                dt = _datetime(year if has_year else now.year,
+                               month, day, hour, minute)
+            else:
+                dt = datetime.datetime.combine(now.date(), datetime.time(hour, minute))
+        except ValueError:
+            dt = None  # e.g. "Feb 30" - let the strptime ladder reject it
 
     # Formats containing a specific Date
     formats_date_with_year = [
@@ -140,69 +381,88 @@ def parse_reset_time(
     # 1. Try formats with explicit Dates first
     if 'at' in clean:
         # First try formats that already have year embedded
-        for fmt in formats_date_with_year:
-            try:
-                dt = datetime.datetime.strptime(clean, fmt)
-                break
-            except ValueError:
-                continue
+        if dt is None:
+            for fmt in formats_date_with_year:
+                try:
+                    dt = datetime.datetime.strptime(clean, fmt)
+                    has_year = True
+                    break
+                except ValueError:
+                    continue
 
         # Then try formats without year (append current year)
         if dt is None:
             for fmt in formats_date_no_year:
                 try:
                     dt = datetime.datetime.strptime(f"{clean} {now.year}", f"{fmt} %Y")
-                    # Year Wrap Logic: If date is way in past, it's next year
-                    if dt < now - timedelta(days=300):
-                        dt = dt.replace(year=now.year + 1)
-                    elif dt > now + timedelta(days=300):
-                        dt = dt.replace(year=now.year - 1)
                     break
                 except ValueError:
                     continue
 
+        # Year Wrap Logic: If date is way in past, it's next year
+        if dt is not None and not has_year:
+            year = now.year
+            if dt < now - _YEAR_WRAP:
+                year += 1
+            elif dt > now + _YEAR_WRAP:
+                year -= 1
+            # Feb 29 has no counterpart in the wrapped year; keep it as parsed
+            if year != now.year and (dt.month, dt.day) != (2, 29):
+                dt = dt.replace(year=year)
+
     # 2. Try Time-Only formats
     else:
-        for fmt in formats_time:
-            try:
-                t = datetime.datetime.strptime(clean, fmt).time()
-                dt = datetime.datetime.combine(now.date(), t)
-
-                # --- FIX: THE TOMORROW LOGIC ---
-                # If we parsed "1:59am" but it is currently "11:58pm",
-                # the parsed date (Today 1:59am) is in the past.
-                # "Resets" always implies the future.
-                if dt < now - timedelta(minutes=15):
-                    if window_hours == 168:
-                        # WEEKLY RESET: Find next occurrence within 7 days
-                        # The reset happens on a specific weekday at this time.
-                        # We need to find the NEXT occurrence, not blindly add 7 days.
-                        # Try each day until we find a future time ≤168h away.
-                        for days in range(1, 8):
-                            candidate = dt + timedelta(days=days)
-                            remaining_hours = (candidate - now).total_seconds() / 3600
-                            if candidate > now and remaining_hours <= 168:
-                                dt = candidate
-                                break
-                    else:
-                        # SESSION RESET: Add 1 day for daily/session windows
-                        dt += timedelta(days=1)
-
-                break
-            except ValueError:
-                continue
+        if dt is None:
+            for fmt in formats_time:
+                try:
+                    t = datetime.datetime.strptime(clean, fmt).time()
+                    dt = datetime.datetime.combine(now.date(), t)
+                    break
+                except ValueError:
+                    continue
+
+        # --- FIX: THE TOMORROW LOGIC ---
+        if dt is not None:
+            dt = _next_reset(dt, now)
 
     return dt
 
 
-def validate_reset_time(
+@functools.lru_cache(maxsize=None)
+def _hours(n: int) -> timedelta:
+    """timedelta of n hours, built once per window size."""
+    return timedelta(hours=n)
+
+
+def _consistency_warning(
+    remain: timedelta,
+    window_hours: int,
+    reset_str: str
+) -> Optional[str]:
+    """Warning if remaining time falls outside 0..window_hours, else None."""
+    # Compared as timedeltas; hours are only worked out for the messages
+    if remain < _hours(0):
+        remain_hours = remain.total_seconds() / 3600
+        return f"Inconsistent: '{reset_str}' → {remain_hours:.1f}h remaining (expected ≥0)"
+
+    if remain > _hours(window_hours):
+        remain_hours = remain.total_seconds() / 3600
+        return f"Inconsistent: '{reset_str}' → {remain_hours:.1f}h remaining (expected ≤{window_hours}h)"
+
+    return None
+
+
+def check_reset_time(
     reset_dt: Optional[datetime.datetime],
     window_hours: int,
     reset_str: str,
     now: Optional[datetime.datetime] = None
-) -> Tuple[Optional[datetime.datetime], Optional[str]]:
+) -> Tuple[Optional[datetime.datetime], Optional[str], Optional[str]]:
     """
-    Validate parsed reset time makes sense.
+    Validate and cross-validate a parsed reset time in one pass.
+
+    Same results as validate_reset_time followed by cross_validate_reset on
+    its output, with the remaining time worked out once.
 
     Args:
         reset_dt: Parsed datetime (may be None)
@@ -211,29 +471,54 @@ def validate_reset_time(
         now: Current datetime (for testing)
 
     Returns:
-        Tuple of (validated_dt, warning_message)
+        Tuple of (validated_dt, warning_message, cross_warning)
         - dt may be None if invalid
-        - warning is None if valid
+        - warnings are None if valid
     """
     if not reset_dt:
-        return None, f"Failed to parse: '{reset_str}'"
+        return None, f"Failed to parse: '{reset_str}'", None
 
     if now is None:
         now = datetime.datetime.now()
 
+    # Compared as timedeltas; hours are only worked out for the messages
     remain = reset_dt - now
-    remain_hours = remain.total_seconds() / 3600
-    max_hours = window_hours + 1  # Small buffer for timing
 
     # Sanity check: time remaining can't exceed window
-    if remain_hours > max_hours:
-        return None, f"Invalid: {remain_hours:.1f}h remaining exceeds {window_hours}h window"
+    if remain > _hours(window_hours + 1):  # Small buffer for timing
+        remain_hours = remain.total_seconds() / 3600
+        return None, f"Invalid: {remain_hours:.1f}h remaining exceeds {window_hours}h window", None
 
     # Sanity check: time remaining shouldn't be very negative
-    if remain_hours < -window_hours:
-        return None, f"Invalid: reset time {remain_hours:.1f}h in past"
+    if remain < _hours(-window_hours):
+        remain_hours = remain.total_seconds() / 3600
+        return None, f"Invalid: reset time {remain_hours:.1f}h in past", None
 
-    return reset_dt, None
+    return reset_dt, None, _consistency_warning(remain, window_hours, reset_str)
+
+
+def validate_reset_time(
+    reset_dt: Optional[datetime.datetime],
+    window_hours: int,
+    reset_str: str,
+    now: Optional[datetime.datetime] = None
+) -> Tuple[Optional[datetime.datetime], Optional[str]]:
+    """
+    Validate parsed reset time makes sense.
+
+    Args:
+        reset_dt: Parsed datetime (may be None)
+        window_hours: Expected window (5 or 168)
+        reset_str: Original string (for error messages)
+        now: Current datetime (for testing)
+
+    Returns:
+        Tuple of (validated_dt, warning_message)
+        - dt may be None if invalid
+        - warning is None if valid
+    """
+    reset_dt, warning, _ = check_reset_time(reset_dt, window_hours, reset_str, now)
+    return reset_dt, warning
 
 
 def cross_validate_reset(
@@ -263,19 +548,68 @@ def cross_validate_reset(
     if now is None:
         now = datetime.datetime.now()
 
-    remain = reset_dt - now
-    remain_hours = remain.total_seconds() / 3600
+    return _consistency_warning(reset_dt - now, window_hours, reset_str)
 
-    # Check bounds based on window type
-    if remain_hours < 0:
-        return f"Inconsistent: '{reset_str}' → {remain_hours:.1f}h remaining (expected ≥0)"
 
-    if remain_hours > window_hours:
-        return f"Inconsistent: '{reset_str}' → {remain_hours:.1f}h remaining (expected ≤{window_hours}h)"
+def _find_used(
+    used_re: re.Pattern,
+    text: str,
+    pos: int,
+    end: int
+) -> Optional[re.Match]:
+    """
+    Same match as used_re.search(text, pos, end) for the "N% used" step.
 
+    Every match ends a digit run at a '%', so only the '%' signs are
+    visited (str.find) and the regex is tried once at the start of the
+    digits before each. The bar between the header and the percentage is
+    skipped without running the regex at each of its characters.
+    """
+    start = pos
+    percent = text.find('%', pos, end)
+    while percent >= 0:
+        # Digit runs never span a '%', so look back no further than start
+        digits = start + len(text[start:percent].rstrip('0123456789'))
+        # Other Unicode digits match \d too; walked one at a time (rare)
+        while digits > start and text[digits - 1].isdecimal():
+            digits -= 1
+        if digits < percent:
+            match = used_re.match(text, digits, end)
+            if match:
+                return match
+        start = percent + 1
+        percent = text.find('%', start, end)
     return None
 
 
+def _search_usage(
+    text: str,
+    steps: Tuple[re.Pattern, re.Pattern, re.Pattern],
+    end: int
+) -> Optional[Tuple[str, str]]:
+    """
+    (used, reset) for a section's (header, used, resets) steps in text[:end].
+
+    Same as searching for the single regex "header.*?used.*?resets" with
+    DOTALL: its match always starts at the first header and takes the first
+    "% used" after it and the first reset after that. Finding each in turn
+    is linear, while the single regex backtracks through every "% used"
+    when no reset follows (quadratic, and worse when two sections are
+    joined into one pattern).
+    """
+    header_re, used_re, resets_re = steps
+    match = header_re.search(text, 0, end)
+    if match:
+        match = _find_used(used_re, text, match.end(), end)
+    if not match:
+        return None
+    used = match.group(1)
+    match = resets_re.search(text, match.end(), end)
+    if not match:
+        return None
+    return used, match.group(1)
+
+
 def extract_usage_data(content: str) -> ParseResult:
     """
     Extract session and week usage data from raw /usage output.
@@ -286,72 +620,85 @@ def extract_usage_data(content: str) -> ParseResult:
     Returns:
         ParseResult with extracted data or error
     """
-    result = ParseResult()
+    # Cheap prefilter: both patterns need an "N% used", and neither CR
+    # normalization nor ANSI stripping can introduce a '%'. A literal
+    # 'Current session' test would wrongly reject "Current   session".
+    if '%' not in content:
+        return ParseResult(error="Session data not found")
 
     # Clean the content
-    content = content.replace('\r\n', '\n').replace('\r', '\n')
+    if '\r' in content:
+        content = _CRLF_RE.sub('\n', content)
     clean_text = strip_ansi(content)
 
-    # Split content at "Current week" to isolate session section
-    session_section = clean_text.split('Current week')[0] if 'Current week' in clean_text else clean_text
+    # Session section ends at the first "Current week" (searched via endpos)
+    session_end = clean_text.find('Current week')
+    if session_end < 0:
+        session_end = len(clean_text)
 
-    # Session: "Current session" ... "X% used" ... "Rese(t)s <time>"
-    # Handle potential character corruption (Reses vs Resets)
-    session_match = re.search(
-        r'Current\s+session.*?(\d+)%\s*used.*?Rese[ts]*\s*(.*?)(?:\s{2,}|\n|$)',
-        session_section, re.DOTALL | re.IGNORECASE
-    )
-
-    # Week: "Current week (all models)" - must explicitly match "(all models)"
-    # to avoid matching "Sonnet only" section
-    week_match = re.search(
-        r'Current\s+week\s+\(all\s+models\).*?(\d+)%\s*used.*?Resets\s*(.*?)(?:\s{2,}|\n|$)',
-        clean_text, re.DOTALL | re.IGNORECASE
-    )
+    session_match = _search_usage(clean_text, _SESSION_STEPS, session_end)
+    week_match = _search_usage(clean_text, _WEEK_STEPS, len(clean_text))
 
     if not session_match:
-        result.error = "Session data not found"
-        return result
+        return ParseResult(error="Session data not found")
 
     if not week_match:
-        result.error = "Week data not found"
-        return result
+        return ParseResult(error="Week data not found")
+
+    session_used, session_reset = session_match
+    week_used, week_reset = week_match
 
     # Extract percentages
-    result.session_percent = int(session_match.group(1))
-    result.session_reset_str = session_match.group(2).strip()
-    result.week_percent = int(week_match.group(1))
-    result.week_reset_str = week_match.group(2).strip()
+    session_percent = int(session_used)
+    session_reset_str = session_reset.strip()
+    week_percent = int(week_used)
+    week_reset_str = week_reset.strip()
+
+    # One clock reading for both sections, parsing and validation alike
+    now = datetime.datetime.now()
 
     # Parse reset times
-    result.session_reset_dt = parse_reset_time(
-        result.session_reset_str,
+    session_reset_dt = parse_reset_time(
+        session_reset_str,
         window_hours=5,
-        section_text=session_section
+        section_text=clean_text,
+        section_end=session_end,
+        now=now
     )
-    result.week_reset_dt = parse_reset_time(
-        result.week_reset_str,
+    week_reset_dt = parse_reset_time(
+        week_reset_str,
         window_hours=168,
-        section_text=clean_text
+        section_text=clean_text,
+        now=now
     )
 
     # Validate reset times
     validated_session, session_warning = validate_reset_time(
-        result.session_reset_dt, 5, result.session_reset_str
+        session_reset_dt, 5, session_reset_str, now
     )
     validated_week, week_warning = validate_reset_time(
-        result.week_reset_dt, 168, result.week_reset_str
+        week_reset_dt, 168, week_reset_str, now
     )
 
+    warnings = []
     if session_warning:
-        result.warnings.append(f"Session: {session_warning}")
-        result.session_reset_dt = validated_session
+        warnings.append(f"Session: {session_warning}")
+        session_reset_dt = validated_session
 
     if week_warning:
-        result.warnings.append(f"Week: {week_warning}")
-        result.week_reset_dt = validated_week
-
-    return result
+        warnings.append(f"Week: {week_warning}")
+        week_reset_dt = validated_week
+
+    # Build the result once from locals rather than mutating it field by field
+    return ParseResult(
+        session_percent=session_percent,
+        session_reset_str=session_reset_str,
+        session_reset_dt=session_reset_dt,
+        week_percent=week_percent,
+        week_reset_str=week_reset_str,
+        week_reset_dt=week_reset_dt,
+        warnings=warnings,
+    )
 
 
 # Format lists exported for fix_generator to modify
@@ -6,11 +6,19 @@ for the cc_usage.sh parser. It can detect parsing failures, classify them,
 generate fixes, and apply them automatically.
 """
 
-from .classifier import FailureClassifier, FailureType
-from .analyzer import RootCauseAnalyzer
-from .fix_generator import FixGenerator, FixCandidate
-from .code_modifier import CodeModifier
-from .regression_detector import RegressionDetector
+import importlib
+
+# Submodule for each re-exported name; imported on first attribute access so
+# that loading one component doesn't drag in all the others
+_EXPORTS = {
+    'FailureClassifier': 'classifier',
+    'FailureType': 'classifier',
+    'RootCauseAnalyzer': 'analyzer',
+    'FixGenerator': 'fix_generator',
+    'FixCandidate': 'fix_generator',
+    'CodeModifier': 'code_modifier',
+    'RegressionDetector': 'regression_detector',
+}
 
 __all__ = [
     'FailureClassifier',
@@ -21,3 +29,10 @@ __all__ = [
     'CodeModifier',
     'RegressionDetector',
 ]
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        module = importlib.import_module(f'.{_EXPORTS[name]}', __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -5,22 +5,34 @@ Analyzes classified failures to determine the specific root cause
 and gather context for fix generation.
 """
 
+import functools
 import re
 from dataclasses import dataclass, field
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Sequence
 from pathlib import Path
 
-from .classifier import ClassifiedFailure, FailureType
+from .classifier import _DATACLASS_SLOTS, ClassifiedFailure, FailureType
 
+# Parser line ranges reported as affected_lines; shared, immutable
+_LINES_ANSI = (181, 182)
+_LINES_PARSE_RESET_TIME = tuple(range(193, 290))
+_LINES_FORMAT_LISTS = tuple(range(230, 244))
+_LINES_YEAR_WRAP = tuple(range(260, 268))
+_LINES_TOMORROW = tuple(range(276, 285))
+_LINES_VALIDATE = tuple(range(292, 314))
+_LINES_EXTRACT = tuple(range(320, 361))
+_LINES_SESSION_REGEX = tuple(range(333, 337))
+_LINES_WEEK_REGEX = tuple(range(340, 344))
 
-@dataclass
+
+@dataclass(**_DATACLASS_SLOTS)
 class RootCause:
     """Detailed root cause analysis of a failure."""
 
     failure: ClassifiedFailure
     description: str
     affected_function: str
-    affected_lines: List[int]
+    affected_lines: Sequence[int]
     suggested_fix_type: str  # e.g., "add_date_format", "broaden_regex"
     context: Dict[str, Any] = field(default_factory=dict)
     requires_ai: bool = False
@@ -45,10 +57,52 @@ class RootCauseAnalyzer:
         "week_regex": (340, 343),
     }
 
-    # Regex for extracting date strings from error messages
-    DATE_STRING_PATTERN = re.compile(
-        r"(?:time data |parse[: ]+)['\"]([^'\"]+)['\"]"
+    # Regexes for extracting date strings from error messages. Each starts
+    # with a literal, which re can scan for quickly; a single alternation
+    # would be tried at every position instead
+    DATE_STRING_PATTERNS = (
+        re.compile(r"time data ['\"]([^'\"]+)['\"]"),
+        re.compile(r"parse[: ]+['\"]([^'\"]+)['\"]"),
+    )
+
+    # Regex for an escaped ANSI sequence quoted in an error message
+    ANSI_SEQUENCE_PATTERN = re.compile(r'\\x1[bB]\[([^m]*m?)')
+
+    # Common date/time shapes and the strptime format each implies
+    DATE_FORMATS = [
+        # Full date + time
+        (r'^([A-Z][a-z]{2})\s+(\d{1,2})\s+(\d{4})\s+at\s+(\d{1,2}):(\d{2})(am|pm)$',
+         '%b %d %Y at %I:%M%p'),
+        (r'^([A-Z][a-z]{2})\s+(\d{1,2})\s+(\d{4})\s+at\s+(\d{1,2})(am|pm)$',
+         '%b %d %Y at %I%p'),
+
+        # Date without year + time
+        (r'^([A-Z][a-z]{2})\s+(\d{1,2})\s+at\s+(\d{1,2}):(\d{2})(am|pm)$',
+         '%b %d at %I:%M%p'),
+        (r'^([A-Z][a-z]{2})\s+(\d{1,2})\s+at\s+(\d{1,2})(am|pm)$',
+         '%b %d at %I%p'),
+
+        # Day-first formats
+        (r'^(\d{1,2})\s+([A-Z][a-z]{2})\s+at\s+(\d{1,2}):(\d{2})(am|pm)$',
+         '%d %b at %I:%M%p'),
+
+        # Time only
+        (r'^(\d{1,2}):(\d{2})(am|pm)$', '%I:%M%p'),
+        (r'^(\d{1,2})(am|pm)$', '%I%p'),
+    ]
+
+    # All shapes in one alternation, tried in order in a single match;
+    # the outer named group that matched identifies the format
+    DATE_FORMAT_PATTERN = re.compile(
+        '|'.join(
+            f'(?P<f{i}>{pattern[1:-1]})$'
+            for i, (pattern, _) in enumerate(DATE_FORMATS)
+        ),
+        re.IGNORECASE,
     )
+    DATE_FORMAT_BY_GROUP = {
+        f'f{i}': fmt for i, (_, fmt) in enumerate(DATE_FORMATS)
+    }
 
     def __init__(self, parser_source: Optional[str] = None):
         """
@@ -58,9 +112,22 @@ class RootCauseAnalyzer:
             parser_source: Source code of the parser (for context extraction)
         """
         self.parser_source = parser_source
-        self._source_lines: Optional[List[str]] = None
-        if parser_source:
-            self._source_lines = parser_source.split('\n')
+
+        self._analyzers = {
+            FailureType.DATE_FORMAT_NEW: self._analyze_date_format,
+            FailureType.REGEX_MISMATCH: self._analyze_regex_mismatch,
+            FailureType.VALIDATION_ERROR: self._analyze_validation_error,
+            FailureType.ANSI_CORRUPTION: self._analyze_ansi_corruption,
+            FailureType.EDGE_CASE: self._analyze_edge_case,
+            FailureType.UNKNOWN: self._analyze_unknown,
+        }
+
+    @functools.cached_property
+    def _source_lines(self) -> Optional[List[str]]:
+        """Parser source split into lines, on first use."""
+        if not self.parser_source:
+            return None
+        return self.parser_source.split('\n')
 
     def analyze(self, failure: ClassifiedFailure) -> RootCause:
         """
@@ -73,23 +140,21 @@ class RootCauseAnalyzer:
             RootCause with detailed analysis
         """
         # Dispatch based on failure type
-        analyzers = {
-            FailureType.DATE_FORMAT_NEW: self._analyze_date_format,
-            FailureType.REGEX_MISMATCH: self._analyze_regex_mismatch,
-            FailureType.VALIDATION_ERROR: self._analyze_validation_error,
-            FailureType.ANSI_CORRUPTION: self._analyze_ansi_corruption,
-            FailureType.EDGE_CASE: self._analyze_edge_case,
-            FailureType.UNKNOWN: self._analyze_unknown,
-        }
-
-        analyzer = analyzers.get(failure.failure_type, self._analyze_unknown)
+        analyzer = self._analyzers.get(
+            failure.failure_type, self._analyze_unknown
+        )
         return analyzer(failure)
 
     def _analyze_date_format(self, failure: ClassifiedFailure) -> RootCause:
         """Analyze a DATE_FORMAT_NEW failure."""
         # Extract the problematic date string
         date_string = None
-        match = self.DATE_STRING_PATTERN.search(failure.exception_message)
+        match = None
+        for pattern in self.DATE_STRING_PATTERNS:
+            candidate = pattern.search(failure.exception_message)
+            # Keep the earliest match in the message
+            if candidate and (match is None or candidate.start() < match.start()):
+                match = candidate
         if match:
             date_string = match.group(1)
 
@@ -105,7 +170,8 @@ class RootCauseAnalyzer:
 
         # Determine which format list to modify
         if date_string and 'at' in date_string.lower():
-            if any(c.isdigit() and len(date_string.split()) > 4 for c in date_string):
+            has_digit = any(c.isdigit() for c in date_string)
+            if has_digit and len(date_string.split()) > 4:
                 suggested_fix = "add_date_format_with_year"
             else:
                 suggested_fix = "add_date_format_no_year"
@@ -116,7 +182,7 @@ class RootCauseAnalyzer:
             failure=failure,
             description=f"New date format not recognized: '{date_string}'",
             affected_function="parse_reset_time",
-            affected_lines=list(range(230, 244)),  # Format lists area
+            affected_lines=_LINES_FORMAT_LISTS,
             suggested_fix_type=suggested_fix,
             context=context,
             requires_ai=inferred_format is None,
@@ -125,18 +191,19 @@ class RootCauseAnalyzer:
     def _analyze_regex_mismatch(self, failure: ClassifiedFailure) -> RootCause:
         """Analyze a REGEX_MISMATCH failure."""
         # Determine which regex failed
-        is_session = "session" in failure.traceback.lower()
-        is_week = "week" in failure.traceback.lower()
+        traceback_lower = failure.traceback.lower()
+        is_session = "session" in traceback_lower
+        is_week = "week" in traceback_lower
 
         if is_session and not is_week:
             affected = "session_regex"
-            lines = list(range(333, 337))
+            lines = _LINES_SESSION_REGEX
         elif is_week:
             affected = "week_regex"
-            lines = list(range(340, 344))
+            lines = _LINES_WEEK_REGEX
         else:
             affected = "extract_usage_data"
-            lines = list(range(320, 361))
+            lines = _LINES_EXTRACT
 
         context = {
             "is_session": is_session,
@@ -156,8 +223,9 @@ class RootCauseAnalyzer:
     def _analyze_validation_error(self, failure: ClassifiedFailure) -> RootCause:
         """Analyze a VALIDATION_ERROR failure."""
         # Check if it's a window exceeded or past time issue
-        is_exceeds = "exceeds" in failure.exception_message.lower()
-        is_past = "past" in failure.exception_message.lower()
+        message_lower = failure.exception_message.lower()
+        is_exceeds = "exceeds" in message_lower
+        is_past = "past" in message_lower
 
         context = {
             "is_window_exceeded": is_exceeds,
@@ -168,7 +236,7 @@ class RootCauseAnalyzer:
             failure=failure,
             description="Validation rejected parsed value",
             affected_function="validate_reset_time",
-            affected_lines=list(range(292, 314)),
+            affected_lines=_LINES_VALIDATE,
             suggested_fix_type="adjust_validation",
             context=context,
             requires_ai=False,
@@ -177,7 +245,7 @@ class RootCauseAnalyzer:
     def _analyze_ansi_corruption(self, failure: ClassifiedFailure) -> RootCause:
         """Analyze an ANSI_CORRUPTION failure."""
         # Try to extract the problematic sequence
-        ansi_match = re.search(r'\\x1[bB]\[([^m]*m?)', failure.exception_message)
+        ansi_match = self.ANSI_SEQUENCE_PATTERN.search(failure.exception_message)
         sequence = ansi_match.group(0) if ansi_match else None
 
         context = {
@@ -188,7 +256,7 @@ class RootCauseAnalyzer:
             failure=failure,
             description="ANSI escape sequence not properly stripped",
             affected_function="strip_ansi",
-            affected_lines=[181, 182],
+            affected_lines=_LINES_ANSI,
             suggested_fix_type="enhance_ansi_regex",
             context=context,
             requires_ai=True,  # ANSI regex can be tricky
@@ -197,11 +265,10 @@ class RootCauseAnalyzer:
     def _analyze_edge_case(self, failure: ClassifiedFailure) -> RootCause:
         """Analyze an EDGE_CASE failure."""
         # Try to determine the specific edge case
-        is_midnight = "midnight" in failure.exception_message.lower() or \
-                      "12:00am" in failure.exception_message.lower()
-        is_year_wrap = "year" in failure.exception_message.lower() or \
-                       ("dec" in failure.exception_message.lower() and
-                        "jan" in failure.exception_message.lower())
+        message_lower = failure.exception_message.lower()
+        is_midnight = "midnight" in message_lower or "12:00am" in message_lower
+        is_year_wrap = "year" in message_lower or \
+                       ("dec" in message_lower and "jan" in message_lower)
 
         context = {
             "is_midnight_crossing": is_midnight,
@@ -210,13 +277,13 @@ class RootCauseAnalyzer:
 
         if is_midnight:
             suggested = "fix_midnight_logic"
-            lines = list(range(276, 285))  # Tomorrow logic
+            lines = _LINES_TOMORROW
         elif is_year_wrap:
             suggested = "fix_year_wrap"
-            lines = list(range(260, 268))  # Year wrap logic
+            lines = _LINES_YEAR_WRAP
         else:
             suggested = "fix_edge_case"
-            lines = list(range(193, 290))  # Entire parse_reset_time
+            lines = _LINES_PARSE_RESET_TIME
 
         return RootCause(
             failure=failure,
@@ -234,7 +301,7 @@ class RootCauseAnalyzer:
             failure=failure,
             description="Unknown failure type - requires AI analysis",
             affected_function="unknown",
-            affected_lines=[],
+            affected_lines=(),
             suggested_fix_type="ai_diagnose",
             context={},
             requires_ai=True,
@@ -250,32 +317,9 @@ class RootCauseAnalyzer:
         Returns:
             Inferred format string or None
         """
-        # Common patterns and their formats
-        patterns = [
-            # Full date + time
-            (r'^([A-Z][a-z]{2})\s+(\d{1,2})\s+(\d{4})\s+at\s+(\d{1,2}):(\d{2})(am|pm)$',
-             '%b %d %Y at %I:%M%p'),
-            (r'^([A-Z][a-z]{2})\s+(\d{1,2})\s+(\d{4})\s+at\s+(\d{1,2})(am|pm)$',
-             '%b %d %Y at %I%p'),
-
-            # Date without year + time
-            (r'^([A-Z][a-z]{2})\s+(\d{1,2})\s+at\s+(\d{1,2}):(\d{2})(am|pm)$',
-             '%b %d at %I:%M%p'),
-            (r'^([A-Z][a-z]{2})\s+(\d{1,2})\s+at\s+(\d{1,2})(am|pm)$',
-             '%b %d at %I%p'),
-
-            # Day-first formats
-            (r'^(\d{1,2})\s+([A-Z][a-z]{2})\s+at\s+(\d{1,2}):(\d{2})(am|pm)$',
-             '%d %b at %I:%M%p'),
-
-            # Time only
-            (r'^(\d{1,2}):(\d{2})(am|pm)$', '%I:%M%p'),
-            (r'^(\d{1,2})(am|pm)$', '%I%p'),
-        ]
-
-        for pattern, fmt in patterns:
-            if re.match(pattern, date_string, re.IGNORECASE):
-                return fmt
+        match = self.DATE_FORMAT_PATTERN.match(date_string)
+        if match:
+            return self.DATE_FORMAT_BY_GROUP[match.lastgroup]
 
         return None
 
@@ -303,9 +347,10 @@ class RootCauseAnalyzer:
         start = max(0, start_line - 1 - context_lines)
         end = min(len(self._source_lines), end_line + context_lines)
 
-        lines = []
-        for i in range(start, end):
-            prefix = ">>> " if start_line - 1 <= i < end_line else "    "
-            lines.append(f"{prefix}{i + 1:4d}: {self._source_lines[i]}")
-
-        return '\n'.join(lines)
+        source_lines = self._source_lines
+        hit_start = start_line - 1
+        return '\n'.join(
+            f"{'>>> ' if hit_start <= i < end_line else '    '}"
+            f"{i + 1:4d}: {source_lines[i]}"
+            for i in range(start, end)
+        )
@@ -4,10 +4,17 @@ Failure classifier for the self-healing test system.
 Categorizes test failures to guide fix generation strategies.
 """
 
+import functools
 import re
+import sys
 from enum import Enum, auto
 from dataclasses import dataclass
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
+
+try:
+    import re2 as _re2
+except ImportError:  # google-re2 is optional; fall back to re
+    _re2 = None
 
 
 class FailureType(Enum):
@@ -21,7 +28,13 @@ class FailureType(Enum):
     UNKNOWN = auto()             # Cannot classify
 
 
-@dataclass
+# Per-failure dataclasses use __slots__ where dataclass supports it (3.10+)
+_DATACLASS_SLOTS: Dict[str, Any] = (
+    {"slots": True} if sys.version_info >= (3, 10) else {}
+)
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class ClassifiedFailure:
     """A classified test failure with metadata."""
 
@@ -83,13 +96,62 @@ class FailureClassifier:
         ],
     }
 
+    # Fallback classification by exception type, checked in order as
+    # substrings of the reported type (e.g. "builtins.ValueError")
+    EXCEPTION_TYPES = {
+        "AttributeError": (FailureType.REGEX_MISMATCH, 0.6),
+        "ValueError": (FailureType.DATE_FORMAT_NEW, 0.5),
+        "KeyError": (FailureType.REGEX_MISMATCH, 0.4),
+        "IndexError": (FailureType.REGEX_MISMATCH, 0.4),
+        "TypeError": (FailureType.UNKNOWN, 0.3),
+    }
+
+    # Any of these makes a pattern a real regex rather than a plain literal
+    _REGEX_METACHARS = re.compile(r'[.^$*+?{}\[\]\\|()]')
+
     def __init__(self):
         """Initialize the classifier."""
+        # Each pattern is compiled twice: case-insensitive for arbitrary text,
+        # and lowercased for matching case-sensitively against lowercased
+        # ASCII text, which lets re use its fast literal-prefix search.
+        # Patterns with uppercase escapes (\S, \D, ...) can't be lowercased
+        # and keep the case-insensitive form for both. Plain literals
+        # ("midnight", "out of range", ...) are matched with a substring
+        # test on the lowercased text instead of a regex search. The lowered
+        # patterns need no flags, so they use re2's linear-time engine when
+        # it is installed.
         self._compiled_patterns: Dict[FailureType, List[tuple]] = {}
         for ftype, patterns in self.PATTERNS.items():
-            self._compiled_patterns[ftype] = [
-                (re.compile(p, re.IGNORECASE), conf) for p, conf in patterns
-            ]
+            compiled = []
+            for p, conf in patterns:
+                any_case = re.compile(p, re.IGNORECASE)
+                lower_case = (
+                    any_case if re.search(r'\\[A-Z]', p)
+                    else self._compile_folded(p.lower())
+                )
+                needle = None if self._REGEX_METACHARS.search(p) else p.lower()
+                compiled.append((p, any_case, lower_case, needle, conf))
+            # Highest confidence first, so a type's scan can stop early
+            compiled.sort(key=lambda entry: -entry[-1])
+            self._compiled_patterns[ftype] = compiled
+        self._max_confidence = max(
+            conf for patterns in self.PATTERNS.values() for _, conf in patterns
+        )
+        # The heal loop re-classifies the same failures every iteration, and
+        # one broken parser path often fails many tests with the same error.
+        # Matching depends only on the exception text and whether the
+        # fixture contains ANSI, so that is all the cache is keyed on.
+        self._match_cached = functools.lru_cache(maxsize=1024)(self._match)
+
+    @staticmethod
+    def _compile_folded(pattern: str):
+        """Compile a lowercased pattern, preferring re2 when available."""
+        if _re2 is not None:
+            try:
+                return _re2.compile(pattern)
+            except _re2.error:
+                pass  # construct re2 doesn't support; use re
+        return re.compile(pattern)
 
     def classify(
         self,
@@ -114,6 +176,42 @@ class FailureClassifier:
         Returns:
             ClassifiedFailure with type and metadata
         """
+        # '\x1b' and '\033' are the same character; one scan suffices
+        fixture_has_ansi = bool(fixture_content) and '\x1b' in fixture_content
+        failure_type, confidence, evidence = self._match_cached(
+            exception_type, exception_message, traceback, fixture_has_ansi,
+        )
+
+        return ClassifiedFailure(
+            failure_type=failure_type,
+            test_name=test_name,
+            fixture_name=fixture_name,
+            exception_type=exception_type,
+            exception_message=exception_message,
+            traceback=traceback,
+            confidence=confidence,
+            # Copy so callers can't mutate the cached evidence
+            evidence={
+                **evidence,
+                "matched_patterns": [
+                    dict(m) for m in evidence["matched_patterns"]
+                ],
+            },
+        )
+
+    def _match(
+        self,
+        exception_type: str,
+        exception_message: str,
+        traceback: str,
+        fixture_has_ansi: bool,
+    ) -> Tuple[FailureType, float, Dict[str, Any]]:
+        """
+        Determine the failure type for the given exception details.
+
+        Returns:
+            Tuple of (FailureType, confidence, evidence)
+        """
         # Combine text for pattern matching
         full_text = f"{exception_type} {exception_message} {traceback}"
 
@@ -123,18 +221,36 @@ class FailureClassifier:
             "matched_patterns": [],
         }
 
-        # Check patterns for each failure type
+        # For ASCII text, lowercasing both sides is exactly case-insensitive
+        # matching; other text keeps the IGNORECASE patterns
+        folded = full_text.isascii()
+        search_text = full_text.lower() if folded else full_text
+
+        # Check patterns for each failure type. Only a strictly higher
+        # confidence can change the result, so each type's scan stops at its
+        # first match or once its remaining patterns can't beat the best,
+        # and the whole scan stops once nothing can. Evidence therefore lists
+        # the matches that decided the classification, not every match.
         for ftype, patterns in self._compiled_patterns.items():
-            for pattern, confidence in patterns:
-                if pattern.search(full_text):
+            for source, any_case, lower_case, needle, confidence in patterns:
+                if confidence <= best_confidence:
+                    break
+                if folded and needle is not None:
+                    matched = needle in search_text
+                else:
+                    pattern = lower_case if folded else any_case
+                    matched = pattern.search(search_text) is not None
+                if matched:
                     evidence["matched_patterns"].append({
                         "type": ftype.name,
-                        "pattern": pattern.pattern,
+                        "pattern": source,
                         "confidence": confidence,
                     })
-                    if confidence > best_confidence:
-                        best_confidence = confidence
-                        best_match = ftype
+                    best_confidence = confidence
+                    best_match = ftype
+                    break
+            if best_confidence >= self._max_confidence:
+                break
 
         # Additional heuristics based on exception type
         if not best_match or best_confidence < 0.7:
@@ -145,29 +261,19 @@ class FailureClassifier:
                 evidence["exception_type_match"] = exception_type
 
         # Check fixture content for ANSI corruption
-        if fixture_content and best_confidence < 0.8:
-            if '\x1b' in fixture_content or '\033' in fixture_content:
-                # ANSI sequences in fixture - might be corruption
-                evidence["ansi_in_fixture"] = True
-                if best_confidence < 0.7:
-                    best_match = FailureType.ANSI_CORRUPTION
-                    best_confidence = 0.75
+        if fixture_has_ansi and best_confidence < 0.8:
+            # ANSI sequences in fixture - might be corruption
+            evidence["ansi_in_fixture"] = True
+            if best_confidence < 0.7:
+                best_match = FailureType.ANSI_CORRUPTION
+                best_confidence = 0.75
 
         # Default to UNKNOWN if no good match
         if not best_match or best_confidence < 0.5:
             best_match = FailureType.UNKNOWN
             best_confidence = 0.0
 
-        return ClassifiedFailure(
-            failure_type=best_match,
-            test_name=test_name,
-            fixture_name=fixture_name,
-            exception_type=exception_type,
-            exception_message=exception_message,
-            traceback=traceback,
-            confidence=best_confidence,
-            evidence=evidence,
-        )
+        return best_match, best_confidence, evidence
 
     def _classify_by_exception_type(self, exception_type: str) -> tuple:
         """
@@ -176,15 +282,12 @@ class FailureClassifier:
         Returns:
             Tuple of (FailureType, confidence)
         """
-        type_mapping = {
-            "AttributeError": (FailureType.REGEX_MISMATCH, 0.6),
-            "ValueError": (FailureType.DATE_FORMAT_NEW, 0.5),
-            "KeyError": (FailureType.REGEX_MISMATCH, 0.4),
-            "IndexError": (FailureType.REGEX_MISMATCH, 0.4),
-            "TypeError": (FailureType.UNKNOWN, 0.3),
-        }
+        # Usually the exception type is exactly one of the keys
+        result = self.EXCEPTION_TYPES.get(exception_type)
+        if result is not None:
+            return result
 
-        for exc_type, result in type_mapping.items():
+        for exc_type, result in self.EXCEPTION_TYPES.items():
             if exc_type in exception_type:
                 return result
 
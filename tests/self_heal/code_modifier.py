@@ -4,6 +4,7 @@ Code modifier for the self-healing test system.
 Safely applies fixes with git branching, syntax validation, and rollback.
 """
 
+import os
 import re
 import subprocess
 import tempfile
@@ -12,10 +13,32 @@ from dataclasses import dataclass
 from typing import Optional, List, Tuple
 from pathlib import Path
 
-from .fix_generator import FixCandidate
+from .classifier import _DATACLASS_SLOTS
+from .fix_generator import FixCandidate, _list_assignment_re
 
+# Hash in the summary line git commit prints, e.g. "[main 1a2b3c4d] msg"
+_COMMIT_SUMMARY_RE = re.compile(r'^\[[^\]]* ([0-9a-f]{7,})\]', re.MULTILINE)
 
-@dataclass
+
+def _write_atomic(path: Path, content: str) -> None:
+    """
+    Replace path's content in one step.
+
+    The text is written to a temporary file beside it, which is then
+    renamed over it, so an interrupted write can't leave a partial file.
+    The file keeps its permissions.
+    """
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_bytes(content.encode("utf-8"))
+    try:
+        os.chmod(tmp_path, path.stat().st_mode & 0o7777)
+        os.replace(tmp_path, path)
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class ModificationResult:
     """Result of a code modification attempt."""
 
@@ -91,13 +114,15 @@ class CodeModifier:
                 lines_changed=lines_changed,
             )
 
-        # Create branch
-        branch_name = self._create_branch(fix)
-        if not branch_name:
-            return ModificationResult(
-                success=False,
-                message="Failed to create git branch",
-            )
+        # The branch is created, and the fix committed, in one git script
+        # once the new content has been validated and written. Without
+        # auto_commit the fix is left as an uncommitted change and git isn't
+        # touched at all.
+        fix_id = self._new_fix_id()
+        branch_name = (
+            f"self-heal/{fix.strategy}/{fix_id}" if self.auto_commit else None
+        )
+        written = False
 
         try:
             # Read current file content
@@ -105,7 +130,6 @@ class CodeModifier:
                 return ModificationResult(
                     success=False,
                     message=f"Target file not found: {target_file}",
-                    branch_name=branch_name,
                 )
 
             original_content = target_file.read_text()
@@ -113,37 +137,41 @@ class CodeModifier:
             # Apply the diff
             new_content = self._apply_diff(original_content, fix)
             if new_content is None:
-                self._abort_branch(branch_name)
                 return ModificationResult(
                     success=False,
                     message="Failed to apply diff - pattern not found",
-                    branch_name=branch_name,
                 )
 
             # Validate Python syntax
             syntax_valid, syntax_error = self._validate_python_syntax(new_content)
             if not syntax_valid:
-                self._abort_branch(branch_name)
                 return ModificationResult(
                     success=False,
                     message=f"Syntax validation failed: {syntax_error}",
-                    branch_name=branch_name,
                 )
 
             # Save rollback patch
             rollback_patch = self._save_rollback(
                 target_file,
                 original_content,
-                branch_name,
+                fix_id,
             )
 
             # Write the new content
-            target_file.write_text(new_content)
+            _write_atomic(target_file, new_content)
+            written = True
 
-            # Commit if auto_commit is enabled
             commit_hash = None
-            if self.auto_commit:
-                commit_hash = self._commit_changes(target_file, fix)
+            if branch_name:
+                branch_created, commit_hash = self._branch_and_commit(
+                    branch_name, target_file, fix
+                )
+                if not branch_created:
+                    _write_atomic(target_file, original_content)
+                    return ModificationResult(
+                        success=False,
+                        message="Failed to create git branch",
+                    )
 
             return ModificationResult(
                 success=True,
@@ -155,46 +183,38 @@ class CodeModifier:
             )
 
         except Exception as e:
-            self._abort_branch(branch_name)
+            if written:
+                if branch_name:
+                    self._abort_branch(branch_name)
+                _write_atomic(target_file, original_content)
             return ModificationResult(
                 success=False,
                 message=f"Exception during fix application: {e}",
-                branch_name=branch_name,
             )
 
-    def rollback(self, branch_name: str) -> bool:
+    def rollback(self, branch_name: Optional[str]) -> bool:
         """
         Rollback changes made by a fix.
 
         Args:
-            branch_name: Name of the branch to rollback
+            branch_name: Name of the branch to rollback (None when the fix
+                wasn't committed, in which case there is nothing to delete)
 
         Returns:
             True if rollback succeeded
         """
-        try:
-            # Get the original branch
-            result = subprocess.run(
-                ["git", "rev-parse", "--abbrev-ref", "HEAD"],
-                capture_output=True,
-                text=True,
-                cwd=self.project_root,
-            )
-            current_branch = result.stdout.strip()
-
-            if current_branch == branch_name:
-                # We're on the branch to rollback, go back to main
-                subprocess.run(
-                    ["git", "checkout", "main"],
-                    capture_output=True,
-                    cwd=self.project_root,
-                )
+        if not branch_name:
+            return False
 
-            # Delete the branch
-            subprocess.run(
-                ["git", "branch", "-D", branch_name],
-                capture_output=True,
-                cwd=self.project_root,
+        try:
+            # If we're on the branch to rollback, go back to main; then
+            # delete the branch
+            self._run_git_script(
+                'if [ "$(git rev-parse --abbrev-ref HEAD)" = "$1" ]; then\n'
+                '    git checkout main\n'
+                'fi\n'
+                'git branch -D "$1"\n',
+                branch_name,
             )
 
             return True
@@ -202,48 +222,104 @@ class CodeModifier:
         except Exception:
             return False
 
-    def _count_diff_lines(self, diff: str) -> int:
-        """Count the number of lines changed in a diff."""
-        added = len(re.findall(r'^\+[^+]', diff, re.MULTILINE))
-        removed = len(re.findall(r'^-[^-]', diff, re.MULTILINE))
-        return added + removed
+    def delete_merged_branches(self, branch_names: List[Optional[str]]) -> bool:
+        """
+        Delete fix branches whose commits a merge has already brought in.
+
+        Uses `git branch -d`, which leaves any branch that isn't merged.
 
-    def _create_branch(self, fix: FixCandidate) -> Optional[str]:
-        """Create a git branch for the fix."""
-        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-        branch_name = f"self-heal/{fix.strategy}/{timestamp}"
+        Args:
+            branch_names: Branches to delete (None entries are skipped)
+
+        Returns:
+            True if every branch was deleted
+        """
+        names = [name for name in branch_names if name]
+        if not names:
+            return False
 
         try:
-            # First ensure we're on a clean state
-            result = subprocess.run(
-                ["git", "checkout", "-b", branch_name],
-                capture_output=True,
-                text=True,
-                cwd=self.project_root,
-            )
+            result = self._run_git_script('git branch -d "$@"\n', *names)
+            return result.returncode == 0
+        except Exception:
+            return False
 
-            if result.returncode != 0:
-                return None
+    def restore(self, result: ModificationResult, target_file: Path) -> bool:
+        """
+        Write back the content target_file had before a fix was applied.
 
-            return branch_name
+        Works without a branch too, so uncommitted fixes (auto_commit=False)
+        are undone as well.
 
-        except Exception:
-            return None
+        Args:
+            result: Result of the apply_fix call to undo
+            target_file: The file the fix was applied to
+
+        Returns:
+            True if the original content was restored
+        """
+        if not result.rollback_patch:
+            return False
+
+        try:
+            _write_atomic(target_file, Path(result.rollback_patch).read_text())
+            return True
+        except OSError:
+            return False
+
+    def _run_git_script(
+        self, script: str, *args: str
+    ) -> subprocess.CompletedProcess:
+        """
+        Run a sequence of git commands in one shell in the project root.
+
+        Each operation spawns a single process from Python rather than one
+        per git command. args are available to the script as $1, $2, ...
+        so values such as commit messages need no quoting.
+        """
+        return subprocess.run(
+            ["sh", "-c", script, "sh", *args],
+            capture_output=True,
+            text=True,
+            cwd=self.project_root,
+        )
+
+    def _count_diff_lines(self, diff: str) -> int:
+        """Count the number of lines changed in a diff."""
+        return (
+            self._count_marked_lines(diff, '+')
+            + self._count_marked_lines(diff, '-')
+        )
+
+    @staticmethod
+    def _count_marked_lines(diff: str, mark: str) -> int:
+        """
+        Count lines starting with mark followed by anything but mark.
+
+        Matches `^+[^+]` in multiline mode (so `+++`/`---` headers and a
+        bare trailing mark don't count), using substring counts rather than
+        a regex scan.
+        """
+        count = diff.count('\n' + mark) - diff.count('\n' + mark * 2)
+        if diff.endswith('\n' + mark):
+            count -= 1
+        if diff[:1] == mark and diff[1:2] not in ('', mark):
+            count += 1
+        return count
+
+    def _new_fix_id(self) -> str:
+        """Id for a fix attempt, shared by its branch and rollback patch."""
+        # Microseconds keep ids unique when fixes are applied back to back
+        return datetime.datetime.now().strftime("%Y%m%d_%H%M%S_%f")
 
     def _abort_branch(self, branch_name: str) -> None:
         """Abort and delete a branch."""
         try:
-            # Go back to main
-            subprocess.run(
-                ["git", "checkout", "main"],
-                capture_output=True,
-                cwd=self.project_root,
-            )
-            # Delete the branch
-            subprocess.run(
-                ["git", "branch", "-D", branch_name],
-                capture_output=True,
-                cwd=self.project_root,
+            # Go back to main and delete the branch
+            self._run_git_script(
+                'git checkout main\n'
+                'git branch -D "$1"\n',
+                branch_name,
             )
         except Exception:
             pass
@@ -257,7 +333,10 @@ class CodeModifier:
         Apply a diff to the original content.
 
         For simple diffs in the fix generator's format, we use
-        pattern-based replacement rather than full diff application.
+        pattern-based replacement rather than full diff application:
+        the n-th removed line is replaced by the n-th added line. The
+        diff applies only if every removed line is found, so a fix is
+        never tested with part of its change missing.
         """
         diff = fix.diff
 
@@ -266,22 +345,33 @@ class CodeModifier:
             return self._apply_format_addition(original, fix)
 
         # Try to extract old/new patterns from diff
-        old_pattern = None
-        new_pattern = None
+        old_patterns = []
+        new_patterns = []
 
-        # Look for -/+ lines in the diff
         for line in diff.split('\n'):
             if line.startswith('-') and not line.startswith('---'):
-                old_pattern = line[1:].strip()
+                old_patterns.append(line[1:].strip())
             elif line.startswith('+') and not line.startswith('+++'):
-                new_pattern = line[1:].strip()
+                new_patterns.append(line[1:].strip())
 
-        if old_pattern and new_pattern:
-            if old_pattern in original:
-                return original.replace(old_pattern, new_pattern, 1)
+        # Unpaired lines can't be expressed as replacements
+        if not old_patterns or len(old_patterns) != len(new_patterns):
+            return None
 
-        # If we can't parse the diff, return None
-        return None
+        # Each line is looked for after the previous one, as diff hunks
+        # are in file order
+        content = original
+        pos = 0
+        for old_pattern, new_pattern in zip(old_patterns, new_patterns):
+            if not old_pattern or not new_pattern:
+                return None
+            # One scan locates the next occurrence and splices around it
+            start = content.find(old_pattern, pos)
+            if start == -1:
+                return None
+            content = content[:start] + new_pattern + content[start + len(old_pattern):]
+            pos = start + len(new_pattern)
+        return content
 
     def _apply_format_addition(
         self,
@@ -296,9 +386,13 @@ class CodeModifier:
         if not list_name or not new_format:
             return None
 
-        # Find the list and add the new format
-        pattern = rf"({list_name}\s*=\s*\[)"
-        match = re.search(pattern, original)
+        # Find the list and add the new format; the generator's recorded
+        # offset is checked first, since earlier fixes may have moved it
+        pattern = _list_assignment_re(list_name)
+        offset = fix.metadata.get("list_offset")
+        match = pattern.match(original, offset) if offset is not None else None
+        if match is None:
+            match = pattern.search(original)
 
         if not match:
             return None
@@ -326,11 +420,10 @@ class CodeModifier:
         self,
         target_file: Path,
         original_content: str,
-        branch_name: str,
+        fix_id: str,
     ) -> str:
         """Save a rollback patch."""
-        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-        patch_name = f"rollback_{timestamp}.patch"
+        patch_name = f"rollback_{fix_id}.patch"
         patch_path = self.rollback_dir / patch_name
 
         # Save the original content
@@ -338,22 +431,20 @@ class CodeModifier:
 
         return str(patch_path)
 
-    def _commit_changes(
+    def _branch_and_commit(
         self,
+        branch_name: str,
         target_file: Path,
         fix: FixCandidate,
-    ) -> Optional[str]:
-        """Commit the changes with a descriptive message."""
-        try:
-            # Stage the file
-            subprocess.run(
-                ["git", "add", str(target_file)],
-                capture_output=True,
-                cwd=self.project_root,
-            )
+    ) -> Tuple[bool, Optional[str]]:
+        """
+        Create the fix branch and commit the fix on it.
 
-            # Create commit message
-            message = f"""[self-heal] {fix.strategy}: {fix.description}
+        Returns:
+            Tuple of (branch_created, commit_hash)
+        """
+        # Create commit message
+        message = f"""[self-heal] {fix.strategy}: {fix.description}
 
 Failure: {fix.root_cause.failure.test_name}
 Type: {fix.root_cause.failure.failure_type.name}
@@ -362,54 +453,52 @@ Confidence: {fix.confidence:.2f}
 Auto-generated by self-healing test system.
 """
 
-            # Commit
-            result = subprocess.run(
-                ["git", "commit", "-m", message],
-                capture_output=True,
-                text=True,
-                cwd=self.project_root,
-            )
+        # Exit status 3 means the branch itself couldn't be created. The
+        # commit names the file, so it needn't be staged first, and its
+        # summary line ("[branch 1a2b3c4d] ...") carries the new hash
+        script = (
+            'git checkout -q -b "$1" || exit 3\n'
+            'git -c core.abbrev=8 commit -m "$3" -- "$2"\n'
+        )
 
-            if result.returncode != 0:
-                return None
-
-            # Get commit hash
-            result = subprocess.run(
-                ["git", "rev-parse", "HEAD"],
-                capture_output=True,
-                text=True,
-                cwd=self.project_root,
+        try:
+            result = self._run_git_script(
+                script, branch_name, str(target_file), message
             )
+        except Exception:
+            return False, None
 
-            return result.stdout.strip()[:8]
+        if result.returncode == 3:
+            return False, None
+        if result.returncode != 0:
+            return True, None
 
-        except Exception:
-            return None
+        # Get commit hash
+        match = _COMMIT_SUMMARY_RE.search(result.stdout)
+        return True, match.group(1)[:8] if match else None
 
-    def merge_to_main(self, branch_name: str) -> bool:
+    def merge_to_main(self, branch_name: Optional[str]) -> bool:
         """
         Merge a fix branch back to main.
 
         Args:
-            branch_name: Name of the branch to merge
+            branch_name: Name of the branch to merge (None when the fix
+                wasn't committed)
 
         Returns:
             True if merge succeeded
         """
-        try:
-            # Checkout main
-            subprocess.run(
-                ["git", "checkout", "main"],
-                capture_output=True,
-                cwd=self.project_root,
-            )
+        if not branch_name:
+            return False
 
-            # Merge the branch
-            result = subprocess.run(
-                ["git", "merge", "--no-ff", branch_name, "-m",
-                 f"Merge self-heal fix: {branch_name}"],
-                capture_output=True,
-                cwd=self.project_root,
+        try:
+            # Checkout main and merge the branch; the script's status is
+            # the merge's
+            result = self._run_git_script(
+                'git checkout main\n'
+                'git merge --no-ff "$1" -m "$2"\n',
+                branch_name,
+                f"Merge self-heal fix: {branch_name}",
             )
 
             return result.returncode == 0
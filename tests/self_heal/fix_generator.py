@@ -4,16 +4,36 @@ Fix generator for the self-healing test system.
 Generates fix candidates based on root cause analysis.
 """
 
+import functools
+import hashlib
+import itertools
+import json
 import re
 from dataclasses import dataclass, field
-from typing import Optional, List, Dict, Any
+from typing import Callable, Optional, List, Dict, Any
 from pathlib import Path
 
 from .analyzer import RootCause
-from .classifier import FailureType
+from .classifier import _DATACLASS_SLOTS, FailureType
 
+_AI_MODEL = "claude-sonnet-4-20250514"
 
-@dataclass
+# Bounds on how much of a root cause's context goes into an AI prompt
+_AI_CONTEXT_MAX_ITEMS = 20
+_AI_CONTEXT_MAX_CHARS = 200
+
+# Sections of an AI response
+_AI_CAUSE_RE = re.compile(r'CAUSE:\s*(.+?)(?=\n\n|DIFF:)', re.DOTALL)
+_AI_DIFF_RE = re.compile(r'```diff\s*\n(.+?)```', re.DOTALL)
+
+
+@functools.lru_cache(maxsize=None)
+def _list_assignment_re(list_name: str) -> "re.Pattern[str]":
+    """Regex for the opening of a `list_name = [` assignment."""
+    return re.compile(rf"({list_name}\s*=\s*\[)")
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class FixCandidate:
     """A proposed fix for a failure."""
 
@@ -43,6 +63,8 @@ class FixGenerator:
         self,
         parser_path: Optional[Path] = None,
         ai_client: Optional[Any] = None,
+        ai_client_factory: Optional[Callable[[], Optional[Any]]] = None,
+        ai_cache_dir: Optional[Path] = None,
     ):
         """
         Initialize the fix generator.
@@ -50,14 +72,39 @@ class FixGenerator:
         Args:
             parser_path: Path to parser_extracted.py
             ai_client: Anthropic client for AI-assisted fixes
+            ai_client_factory: Builds the client on first AI-assisted fix,
+                used instead of ai_client so runs that never need AI
+                don't pay for it
+            ai_cache_dir: Directory for cached AI responses, keyed by
+                prompt, so repeat failures don't repeat the API call
         """
         self.parser_path = parser_path
-        self.ai_client = ai_client
+        self._ai_client = ai_client
+        self._ai_client_factory = ai_client_factory
         self._parser_source: Optional[str] = None
+        self.ai_cache_dir = ai_cache_dir
+        self._ai_enabled = ai_client is not None or ai_client_factory is not None
+        self._ai_responses: Dict[str, str] = {}
+        self._list_offsets: Dict[str, Optional[int]] = {}
+
+        if ai_cache_dir:
+            ai_cache_dir.mkdir(parents=True, exist_ok=True)
 
         if parser_path and parser_path.exists():
             self._parser_source = parser_path.read_text()
 
+        self._generators = {
+            "add_date_format_with_year": self._fix_add_date_format_with_year,
+            "add_date_format_no_year": self._fix_add_date_format_no_year,
+            "add_time_format": self._fix_add_time_format,
+            "broaden_regex": self._fix_broaden_regex,
+            "adjust_validation": self._fix_adjust_validation,
+            "enhance_ansi_regex": self._fix_enhance_ansi_regex,
+            "fix_midnight_logic": self._fix_midnight_logic,
+            "fix_year_wrap": self._fix_year_wrap,
+            "ai_diagnose": self._fix_with_ai,
+        }
+
     def generate_fixes(
         self,
         root_cause: RootCause,
@@ -73,19 +120,7 @@ class FixGenerator:
         Returns:
             List of FixCandidate objects, ordered by confidence
         """
-        generators = {
-            "add_date_format_with_year": self._fix_add_date_format_with_year,
-            "add_date_format_no_year": self._fix_add_date_format_no_year,
-            "add_time_format": self._fix_add_time_format,
-            "broaden_regex": self._fix_broaden_regex,
-            "adjust_validation": self._fix_adjust_validation,
-            "enhance_ansi_regex": self._fix_enhance_ansi_regex,
-            "fix_midnight_logic": self._fix_midnight_logic,
-            "fix_year_wrap": self._fix_year_wrap,
-            "ai_diagnose": self._fix_with_ai,
-        }
-
-        generator = generators.get(
+        generator = self._generators.get(
             root_cause.suggested_fix_type,
             self._fix_with_ai
         )
@@ -128,6 +163,7 @@ class FixGenerator:
                 "format": inferred_format,
                 "example": date_string,
                 "list_name": "DATE_FORMATS_WITH_YEAR",
+                "list_offset": self._list_offset("DATE_FORMATS_WITH_YEAR"),
             },
         )]
 
@@ -160,6 +196,7 @@ class FixGenerator:
                 "format": inferred_format,
                 "example": date_string,
                 "list_name": "DATE_FORMATS_NO_YEAR",
+                "list_offset": self._list_offset("DATE_FORMATS_NO_YEAR"),
             },
         )]
 
@@ -192,6 +229,7 @@ class FixGenerator:
                 "format": inferred_format,
                 "example": date_string,
                 "list_name": "TIME_FORMATS",
+                "list_offset": self._list_offset("TIME_FORMATS"),
             },
         )]
 
@@ -214,9 +252,9 @@ class FixGenerator:
                 description="Make session regex whitespace more flexible",
                 diff="""--- a/tests/parser_extracted.py
 +++ b/tests/parser_extracted.py
-@@ session_match pattern @@
--    r'Current\\s+session.*?(\\d+)%\\s*used.*?Rese[ts]*\\s*(.*?)(?:\\s{2,}|\\n|$)',
-+    r'Current\\s+session.*?(\\d+)%\\s*used.*?Rese[ts]*\\s*(.*?)(?:\\s+|\\n|$)',
+@@ _SESSION_STEPS @@
+-    re.compile(r'Rese[ts]*\\s*(.*?)(?:\\s{2,}|\\n|$)', re.DOTALL | re.IGNORECASE),
++    re.compile(r'Rese[ts]*\\s*(.*?)(?:\\s+|\\n|$)', re.DOTALL | re.IGNORECASE),
 """,
                 confidence=0.6,
                 strategy="broaden_regex",
@@ -229,9 +267,12 @@ class FixGenerator:
                 description="Make week regex whitespace more flexible",
                 diff="""--- a/tests/parser_extracted.py
 +++ b/tests/parser_extracted.py
-@@ week_match pattern @@
--    r'Current\\s+week\\s+\\(all\\s+models\\).*?(\\d+)%\\s*used.*?Resets\\s*(.*?)(?:\\s{2,}|\\n|$)',
-+    r'Current\\s+week\\s*\\(all\\s+models\\).*?(\\d+)%\\s*used.*?Resets\\s*(.*?)(?:\\s+|\\n|$)',
+@@ _WEEK_STEPS @@
+-    re.compile(r'Current\\s+week\\s+\\(all\\s+models\\)', re.IGNORECASE),
++    re.compile(r'Current\\s+week\\s*\\(all\\s+models\\)', re.IGNORECASE),
+     _USED_RE,
+-    re.compile(r'Resets\\s*(.*?)(?:\\s{2,}|\\n|$)', re.DOTALL | re.IGNORECASE),
++    re.compile(r'Resets\\s*(.*?)(?:\\s+|\\n|$)', re.DOTALL | re.IGNORECASE),
 """,
                 confidence=0.6,
                 strategy="broaden_regex",
@@ -257,9 +298,9 @@ class FixGenerator:
                 description="Increase validation buffer for window check",
                 diff="""--- a/tests/parser_extracted.py
 +++ b/tests/parser_extracted.py
-@@ validate_reset_time @@
--    max_hours = window_hours + 1  # Small buffer for timing
-+    max_hours = window_hours + 2  # Increased buffer for timing
+@@ check_reset_time @@
+-    if remain > _hours(window_hours + 1):  # Small buffer for timing
++    if remain > _hours(window_hours + 2):  # Increased buffer for timing
 """,
                 confidence=0.7,
                 strategy="adjust_threshold",
@@ -272,9 +313,9 @@ class FixGenerator:
                 description="Increase tolerance for past times",
                 diff="""--- a/tests/parser_extracted.py
 +++ b/tests/parser_extracted.py
-@@ validate_reset_time @@
--    if remain_hours < -window_hours:
-+    if remain_hours < -window_hours * 1.5:
+@@ check_reset_time @@
+-    if remain < _hours(-window_hours):
++    if remain < _hours(-window_hours) * 1.5:
 """,
                 confidence=0.6,
                 strategy="adjust_threshold",
@@ -299,9 +340,9 @@ class FixGenerator:
                 description="Enhance ANSI regex to handle more sequences",
                 diff="""--- a/tests/parser_extracted.py
 +++ b/tests/parser_extracted.py
-@@ strip_ansi @@
--    return re.sub(r'\\x1B(?:[@-Z\\\\-_]|\\[[0-?]*[ -/]*[@-~])', '', text)
-+    return re.sub(r'\\x1B(?:[@-Z\\\\-_]|\\[[0-?]*[ -/]*[@-~]|\\].*?(?:\\x07|\\x1B\\\\))', '', text)
+@@ _ANSI_RE @@
+-_ANSI_RE = re.compile(r'\\x1B(?:[@-Z\\\\-_]|\\[[0-?]*[ -/]*[@-~])')
++_ANSI_RE = re.compile(r'\\x1B(?:[@-Z\\\\-_]|\\[[0-?]*[ -/]*[@-~]|\\].*?(?:\\x07|\\x1B\\\\))')
 """,
                 confidence=0.7,
                 strategy="enhance_regex",
@@ -318,9 +359,9 @@ class FixGenerator:
             description="Adjust tomorrow logic buffer for midnight edge cases",
             diff="""--- a/tests/parser_extracted.py
 +++ b/tests/parser_extracted.py
-@@ tomorrow logic @@
--                if dt < now - timedelta(minutes=15):
-+                if dt < now - timedelta(minutes=30):
+@@ _next_reset @@
+-    if dt < now - _RESET_GRACE:
++    if dt < now - timedelta(minutes=30):
 """,
             confidence=0.65,
             strategy="fix_edge_case",
@@ -334,19 +375,54 @@ class FixGenerator:
             diff="""--- a/tests/parser_extracted.py
 +++ b/tests/parser_extracted.py
 @@ year wrap @@
--                    if dt < now - timedelta(days=300):
-+                    if dt < now - timedelta(days=330):
+-            if dt < now - _YEAR_WRAP:
++            if dt < now - timedelta(days=330):
 """,
             confidence=0.65,
             strategy="fix_edge_case",
         )]
 
+    def _list_offset(self, list_name: str) -> Optional[int]:
+        """Offset of the `list_name = [` assignment in the parser source."""
+        if list_name not in self._list_offsets:
+            match = None
+            if self._parser_source:
+                match = _list_assignment_re(list_name).search(self._parser_source)
+            self._list_offsets[list_name] = match.start() if match else None
+        return self._list_offsets[list_name]
+
+    @functools.cached_property
+    def _numbered_parser_lines(self) -> Optional[List[str]]:
+        """Parser source lines prefixed with line numbers, on first use."""
+        if not self._parser_source:
+            return None
+        return [
+            f"{i:4d}: {line}"
+            for i, line in enumerate(self._parser_source.split('\n'), 1)
+        ]
+
+    @property
+    def ai_client(self) -> Optional[Any]:
+        """The AI client, built from the factory on first access."""
+        if self._ai_client is None and self._ai_client_factory is not None:
+            self._ai_client = self._ai_client_factory()
+            self._ai_client_factory = None
+        return self._ai_client
+
     def _fix_with_ai(self, root_cause: RootCause) -> List[FixCandidate]:
         """
         Use AI to diagnose and generate a fix.
 
         This is the fallback for complex or unknown failures.
         """
+        # Build prompt for AI
+        prompt = self._build_ai_prompt(root_cause)
+
+        # A cached response needs no client, but only counts when AI is on
+        cached = self._cached_ai_response(prompt) if self._ai_enabled else None
+        if cached is not None:
+            return self._parse_ai_response(cached, root_cause)
+
         if not self.ai_client:
             # Return placeholder that indicates AI is needed
             return [FixCandidate(
@@ -358,18 +434,17 @@ class FixGenerator:
                 metadata={"requires_ai": True},
             )]
 
-        # Build prompt for AI
-        prompt = self._build_ai_prompt(root_cause)
-
         try:
             response = self.ai_client.messages.create(
-                model="claude-sonnet-4-20250514",
+                model=_AI_MODEL,
                 max_tokens=2000,
                 messages=[{"role": "user", "content": prompt}]
             )
+            text = response.content[0].text
+            self._cache_ai_response(prompt, text)
 
             # Parse AI response
-            return self._parse_ai_response(response.content[0].text, root_cause)
+            return self._parse_ai_response(text, root_cause)
 
         except Exception as e:
             return [FixCandidate(
@@ -381,6 +456,38 @@ class FixGenerator:
                 metadata={"error": str(e)},
             )]
 
+    @staticmethod
+    def _ai_cache_key(prompt: str) -> str:
+        """Cache key for a prompt sent to the current model."""
+        return hashlib.blake2b(
+            f"{_AI_MODEL}\n{prompt}".encode(), digest_size=16
+        ).hexdigest()
+
+    def _cached_ai_response(self, prompt: str) -> Optional[str]:
+        """Return a previously received response to prompt, if any."""
+        key = self._ai_cache_key(prompt)
+        text = self._ai_responses.get(key)
+        if text is None and self.ai_cache_dir:
+            try:
+                data = json.loads((self.ai_cache_dir / f"{key}.json").read_text())
+                text = data["response"]
+            except (OSError, ValueError, KeyError, TypeError):
+                return None
+            self._ai_responses[key] = text
+        return text
+
+    def _cache_ai_response(self, prompt: str, text: str) -> None:
+        """Remember the response to prompt, in memory and on disk."""
+        key = self._ai_cache_key(prompt)
+        self._ai_responses[key] = text
+        if self.ai_cache_dir:
+            try:
+                (self.ai_cache_dir / f"{key}.json").write_text(
+                    json.dumps({"model": _AI_MODEL, "response": text})
+                )
+            except OSError:
+                pass  # Caching is best effort
+
     def _build_ai_prompt(self, root_cause: RootCause) -> str:
         """Build a prompt for AI-assisted fix generation."""
         failure = root_cause.failure
@@ -388,12 +495,18 @@ class FixGenerator:
         # Get relevant source code
         source_context = ""
         if self._parser_source and root_cause.affected_lines:
-            lines = self._parser_source.split('\n')
+            lines = self._numbered_parser_lines
             start = max(0, min(root_cause.affected_lines) - 10)
             end = min(len(lines), max(root_cause.affected_lines) + 10)
-            source_context = '\n'.join(
-                f"{i+1:4d}: {lines[i]}" for i in range(start, end)
+            source_context = '\n'.join(lines[start:end])
+
+        # One bounded line per context entry rather than the dict's repr
+        context = '\n'.join(
+            f"- {key}: {str(value)[:_AI_CONTEXT_MAX_CHARS]}"
+            for key, value in itertools.islice(
+                root_cause.context.items(), _AI_CONTEXT_MAX_ITEMS
             )
+        )
 
         return f"""Analyze this parsing failure and provide a minimal fix.
 
@@ -408,7 +521,7 @@ class FixGenerator:
 - Suggested Fix Type: {root_cause.suggested_fix_type}
 
 ## Context
-{root_cause.context}
+{context}
 
 ## Relevant Source Code
 ```python
@@ -438,11 +551,11 @@ DIFF:
     ) -> List[FixCandidate]:
         """Parse AI response to extract fix candidate."""
         # Extract cause
-        cause_match = re.search(r'CAUSE:\s*(.+?)(?=\n\n|DIFF:)', response, re.DOTALL)
+        cause_match = _AI_CAUSE_RE.search(response)
         cause = cause_match.group(1).strip() if cause_match else "AI-generated fix"
 
         # Extract diff
-        diff_match = re.search(r'```diff\s*\n(.+?)```', response, re.DOTALL)
+        diff_match = _AI_DIFF_RE.search(response)
         diff = diff_match.group(1).strip() if diff_match else ""
 
         if diff:
@@ -4,10 +4,12 @@ Regression detector for the self-healing test system.
 Ensures fixes don't break existing functionality and prevents infinite loops.
 """
 
-import hashlib
-import json
+import functools
+import itertools
+from collections import Counter, deque
 from dataclasses import dataclass, field
-from typing import Dict, List, Set, Optional
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Set, Optional
 from pathlib import Path
 from datetime import datetime
 
@@ -16,24 +18,36 @@ from datetime import datetime
 class TestState:
     """State of all tests at a point in time."""
 
-    results: Dict[str, bool]  # test_name -> passed
+    results: Mapping[str, bool]  # test_name -> passed
     timestamp: datetime = field(default_factory=datetime.now)
 
+    @functools.cached_property
+    def fingerprint(self) -> int:
+        """
+        Order-independent fingerprint of the results.
+
+        XOR of each (test, passed) pair's hash: O(N) with no sorting or
+        serialisation. Built on hash(), so it is only comparable within
+        one process, which is all oscillation detection needs.
+        """
+        fingerprint = 0
+        for item in self.results.items():
+            fingerprint ^= hash(item)
+        return fingerprint
+
     @property
     def state_hash(self) -> str:
         """Generate a hash of the test state for comparison."""
-        # Sort keys for consistent hashing
-        sorted_results = sorted(self.results.items())
-        state_str = json.dumps(sorted_results)
-        return hashlib.md5(state_str.encode()).hexdigest()[:16]
+        return format(self.fingerprint & 0xFFFFFFFFFFFFFFFF, '016x')
 
-    @property
+    @functools.cached_property
     def passed_count(self) -> int:
-        return sum(1 for v in self.results.values() if v)
+        # One pass over the results; failed_count derives from it
+        return sum(map(bool, self.results.values()))
 
     @property
     def failed_count(self) -> int:
-        return sum(1 for v in self.results.values() if not v)
+        return len(self.results) - self.passed_count
 
     @property
     def total_count(self) -> int:
@@ -47,7 +61,17 @@ class TestState:
             Dict of test_name -> (old_result, new_result)
         """
         changes = {}
-        all_tests = set(self.results.keys()) | set(other.results.keys())
+
+        # Usually both runs cover the same tests and only outcomes differ
+        if self.results.keys() == other.results.keys():
+            other_results = other.results
+            for test, old in self.results.items():
+                new = other_results[test]
+                if old != new:
+                    changes[test] = (old, new)
+            return changes
+
+        all_tests = self.results.keys() | other.results.keys()
 
         for test in all_tests:
             old = self.results.get(test)
@@ -94,28 +118,39 @@ class RegressionDetector:
         """
         self.oscillation_window = oscillation_window
         self.require_net_progress = require_net_progress
-        self._state_history: List[TestState] = []
-        self._hash_set: Set[str] = set()
+        self._state_history: deque = deque(maxlen=oscillation_window)
+        # Fingerprint -> number of states in the window carrying it
+        self._fingerprint_counts: Counter = Counter()
 
     def record_state(self, results: Dict[str, bool]) -> TestState:
         """
         Record a test state.
 
+        The detector takes ownership of ``results`` rather than copying it;
+        callers must not modify the dict afterwards. The state exposes it
+        through a read-only view so its cached fingerprint stays valid.
+
         Args:
             results: Dict of test_name -> passed
 
         Returns:
             The recorded TestState
         """
-        state = TestState(results=results.copy())
-        self._state_history.append(state)
-
-        # Keep only the window
-        if len(self._state_history) > self.oscillation_window:
-            old_state = self._state_history.pop(0)
-            self._hash_set.discard(old_state.state_hash)
-
-        self._hash_set.add(state.state_hash)
+        state = TestState(results=MappingProxyType(results))
+
+        # The deque keeps only the window; uncount the state it will evict
+        history = self._state_history
+        if len(history) == history.maxlen:
+            if not history:
+                return state  # zero-length window keeps nothing
+            counts = self._fingerprint_counts
+            old_fingerprint = history[0].fingerprint
+            counts[old_fingerprint] -= 1
+            if not counts[old_fingerprint]:
+                del counts[old_fingerprint]
+
+        history.append(state)
+        self._fingerprint_counts[state.fingerprint] += 1
 
         return state
 
@@ -134,19 +169,21 @@ class RegressionDetector:
         Returns:
             RegressionReport with details
         """
-        diff = before.diff(after)
-
         newly_failing = []
         newly_passing = []
 
-        for test, (old, new) in diff.items():
+        # Only tests present in both states can flip, so one pass over
+        # before's results covers them without building a diff
+        after_results = after.results
+        for test, old in before.results.items():
+            new = after_results.get(test)
             if old is True and new is False:
                 newly_failing.append(test)
             elif old is False and new is True:
                 newly_passing.append(test)
 
         net_change = len(newly_passing) - len(newly_failing)
-        has_regression = len(newly_failing) > 0
+        has_regression = bool(newly_failing)
 
         if has_regression:
             message = f"REGRESSION: {len(newly_failing)} tests now failing"
@@ -175,18 +212,15 @@ class RegressionDetector:
         Returns:
             True if oscillation detected
         """
-        if state:
-            target_hash = state.state_hash
-        elif self._state_history:
-            target_hash = self._state_history[-1].state_hash
-        else:
+        if not self._state_history:
             return False
+        latest = self._state_history[-1].fingerprint
+        target = state.fingerprint if state else latest
 
-        # Check if this hash has been seen before (excluding current)
-        count = sum(
-            1 for s in self._state_history[:-1]
-            if s.state_hash == target_hash
-        )
+        # Check if this state has been seen before (excluding current)
+        count = self._fingerprint_counts[target]
+        if target == latest:
+            count -= 1
 
         return count > 0
 
@@ -221,6 +255,21 @@ class RegressionDetector:
 
         return False, ""
 
+    def flaky_tests(self, max_flips: int = 2) -> Set[str]:
+        """
+        Tests whose outcome flipped more than ``max_flips`` times in the window.
+
+        Such tests pass or fail depending on which fix was applied last, so
+        another fix attempt is unlikely to settle them.
+        """
+        flips: Dict[str, int] = {}
+        history = self._state_history
+        for before, after in zip(history, itertools.islice(history, 1, None)):
+            for test, (old, new) in before.diff(after).items():
+                if old is not None and new is not None:
+                    flips[test] = flips.get(test, 0) + 1
+        return {test for test, count in flips.items() if count > max_flips}
+
     def get_history_summary(self) -> str:
         """Get a summary of the state history."""
         if not self._state_history:
@@ -239,7 +288,7 @@ class RegressionDetector:
     def reset(self) -> None:
         """Reset the detector state."""
         self._state_history.clear()
-        self._hash_set.clear()
+        self._fingerprint_counts.clear()
 
 
 @dataclass
@@ -6,11 +6,147 @@ code in cc_usage.sh. This prevents the critical bug where tests pass
 against the extracted code but the actual script has different behavior.
 """
 
+import ast
 import re
 import difflib
+import functools
+import textwrap
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, List, Tuple
+from typing import Dict, Optional, List, Tuple
+
+# normalize_code rewrites, compiled once.
+# Inline comment: the first '#' outside a single-line string literal
+_INLINE_COMMENT_RE = re.compile(
+    r'''^((?:[^#'"\n]|'[^'\n]*'|"[^"\n]*")*?)\s*#.*$''', re.MULTILINE
+)
+_TYPE_HINT_RE = re.compile(r': [A-Za-z\[\], ]+(?=[,\)])')
+_RETURN_HINT_RE = re.compile(r' -> [A-Za-z\[\], ]+:')
+_OPTIONAL_RE = re.compile(r'Optional\[([^\]]+)\]')
+
+# The heredoc holding the embedded Python in cc_usage.sh
+_EMBEDDED_PYTHON_RE = re.compile(
+    r"python3\s+-.*?<<'END_PYTHON'\s*\n(.*?)\nEND_PYTHON", re.DOTALL
+)
+
+
+@functools.lru_cache(maxsize=4)
+def _extract_embedded(content: str) -> Optional[str]:
+    match = _EMBEDDED_PYTHON_RE.search(content)
+    return match.group(1) if match else None
+
+
+@functools.lru_cache(maxsize=4)
+def _top_level_definitions(source: str) -> Optional[Dict[str, str]]:
+    # One parse yields every top-level def and `NAME = ...` assignment;
+    # None if the source won't parse
+    try:
+        tree = ast.parse(source)
+    except SyntaxError:
+        return None
+    lines = source.split('\n')
+    definitions = {}
+    for node in tree.body:
+        if isinstance(node, ast.FunctionDef):
+            name = node.name
+            # Start at the first decorator so e.g. an lru_cache is compared too
+            start = min([node.lineno] + [d.lineno for d in node.decorator_list])
+        elif (isinstance(node, ast.Assign) and len(node.targets) == 1
+                and isinstance(node.targets[0], ast.Name)):
+            name = node.targets[0].id
+            start = node.lineno
+        elif (isinstance(node, ast.AnnAssign) and node.value is not None
+                and isinstance(node.target, ast.Name)):
+            name = node.target.id
+            start = node.lineno
+        else:
+            continue
+        definitions[name] = '\n'.join(lines[start - 1:node.end_lineno]).rstrip()
+    return definitions
+
+
+@functools.lru_cache(maxsize=None)
+def _definition_re(name: str) -> "re.Pattern[str]":
+    """Regex for a top-level `def name(...)` or `name = ...` and its body."""
+    return re.compile(
+        rf'^((?:def {name}\s*\([^)]*\)|{name}\s*[:=]).*?)'
+        rf'(?=\n(?:def |class |[A-Za-z_]|\Z))',
+        re.MULTILINE | re.DOTALL,
+    )
+
+
+@functools.lru_cache(maxsize=64)
+def _extract_definition(source: str, name: str) -> Optional[str]:
+    # Fallback for sources that don't parse: match the definition and its
+    # body up to the next top-level statement
+    match = _definition_re(name).search(source)
+    return match.group(1).rstrip() if match else None
+
+
+# Testability setup parser_extracted.py adds around the 'now' parameter
+_NOW_SETUP = {
+    ast.dump(ast.parse(stmt).body[0]) for stmt in (
+        'now = datetime.datetime.now()',
+        'if now is None:\n    now = datetime.datetime.now()',
+    )
+}
+
+
+class _Normalizer(ast.NodeTransformer):
+    """Drop what may legitimately differ between the two copies."""
+
+    def _strip_docstring(self, node):
+        body = node.body
+        if (len(body) > 1 and isinstance(body[0], ast.Expr)
+                and isinstance(body[0].value, ast.Constant)
+                and isinstance(body[0].value.value, str)):
+            node.body = body[1:]
+
+    def visit_Module(self, node):
+        self._strip_docstring(node)
+        return self.generic_visit(node)
+
+    def visit_ClassDef(self, node):
+        self._strip_docstring(node)
+        return self.generic_visit(node)
+
+    def visit_FunctionDef(self, node):
+        self._strip_docstring(node)
+        node.body = [
+            stmt for stmt in node.body if ast.dump(stmt) not in _NOW_SETUP
+        ] or [ast.Pass()]
+        node.returns = None
+
+        # The extracted module takes an optional trailing 'now' for tests;
+        # anywhere else it is a real signature difference and is kept
+        args = node.args
+        if (args.args and args.args[-1].arg == 'now' and args.defaults
+                and not args.vararg and not args.kwonlyargs
+                and not args.kwarg):
+            del args.args[-1]
+            del args.defaults[-1]
+        return self.generic_visit(node)
+
+    def visit_arg(self, node):
+        node.annotation = None
+        return node
+
+    def visit_AnnAssign(self, node):
+        if node.value is None:
+            return None
+        assign = ast.Assign(targets=[node.target], value=node.value)
+        return self.generic_visit(ast.copy_location(assign, node))
+
+
+@functools.lru_cache(maxsize=64)
+def _normalize_ast(code: str) -> Optional[str]:
+    # Pure in the source text, so unchanged functions normalize for free;
+    # None if the code doesn't parse
+    try:
+        tree = ast.parse(textwrap.dedent(code))
+    except SyntaxError:
+        return None
+    return ast.unparse(_Normalizer().visit(tree))
 
 
 @dataclass
@@ -38,16 +174,46 @@ class SyncVerifier:
     and:
         END_PYTHON
 
-    This verifier extracts that code and compares the core parsing functions
-    to their counterparts in parser_extracted.py.
+    This verifier extracts that code and compares the core parsing functions,
+    and the precompiled patterns and constants they read, to their
+    counterparts in parser_extracted.py.
     """
 
     # Functions that must stay in sync between the two files
     SYNC_FUNCTIONS = [
         'strip_ansi',
         'clean_date_string',
+        '_is_time_colon',
+        '_last_full_time',
+        '_reset_time_components',
+        '_datetime',
+        '_next_reset',
         'parse_reset_time',
+        '_hours',
+        '_consistency_warning',
+        'check_reset_time',
         'validate_reset_time',
+        'cross_validate_reset',
+        '_find_used',
+        '_search_usage',
+    ]
+
+    # Module-level constants those functions read, compared the same way
+    SYNC_CONSTANTS = [
+        '_ANSI_RE',
+        '_TIME_RE',
+        '_FULL_TIME_RE',
+        '_DATE_PREFIX_RE',
+        '_DIGITS',
+        '_CRLF_RE',
+        '_RESET_PARSE_RE',
+        '_MONTHS',
+        '_RESET_GRACE',
+        '_ONE_DAY',
+        '_YEAR_WRAP',
+        '_USED_RE',
+        '_SESSION_STEPS',
+        '_WEEK_STEPS',
     ]
 
     def __init__(
@@ -65,6 +231,26 @@ class SyncVerifier:
         project_root = Path(__file__).parent.parent.parent
         self.script_path = script_path or project_root / "cc_usage.sh"
         self.module_path = module_path or project_root / "tests" / "parser_extracted.py"
+        # Last verify() result, keyed by both files' (mtime_ns, size)
+        self._verify_cache: Dict[tuple, SyncStatus] = {}
+        # path -> ((mtime_ns, size), text) of the last read
+        self._file_cache: Dict[Path, Tuple[tuple, str]] = {}
+        # func_name -> (embedded_func, module_func, result) of the last compare
+        self._compare_cache: Dict[str, tuple] = {}
+
+    def _read_cached(self, path: Path) -> Optional[str]:
+        """Read a file, reusing the last read while its mtime/size hold."""
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            return None
+        key = (st.st_mtime_ns, st.st_size)
+        cached = self._file_cache.get(path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        content = path.read_text()
+        self._file_cache[path] = (key, content)
+        return content
 
     def extract_embedded_python(self) -> Optional[str]:
         """
@@ -73,49 +259,52 @@ class SyncVerifier:
         Returns:
             The embedded Python code, or None if extraction fails
         """
-        if not self.script_path.exists():
+        content = self._read_cached(self.script_path)
+        if content is None:
             return None
 
-        content = self.script_path.read_text()
-
         # Find the heredoc boundaries
         # Pattern: python3 - ... <<'END_PYTHON' ... END_PYTHON
-        match = re.search(
-            r"python3\s+-.*?<<'END_PYTHON'\s*\n(.*?)\nEND_PYTHON",
-            content,
-            re.DOTALL
-        )
-
-        if not match:
-            return None
-
-        return match.group(1)
+        return _extract_embedded(content)
 
     def extract_function(self, source: str, func_name: str) -> Optional[str]:
         """
         Extract a function definition from Python source code.
 
+        Top-level `NAME = ...` constants are found the same way.
+
         Args:
             source: Python source code
-            func_name: Name of function to extract
+            func_name: Name of function (or constant) to extract
 
         Returns:
             Function source code, or None if not found
         """
-        # Pattern to match function definition and its body
-        # This handles the indentation-based scope of Python
-        pattern = rf'^(def {func_name}\s*\([^)]*\).*?)(?=\n(?:def |class |[A-Za-z_]|\Z))'
-
-        match = re.search(pattern, source, re.MULTILINE | re.DOTALL)
-        if match:
-            return match.group(1).rstrip()
-
-        return None
+        # Every top-level definition comes out of a single cached parse, so
+        # comparing several functions only parses each source once
+        definitions = _top_level_definitions(source)
+        if definitions is None:
+            return _extract_definition(source, func_name)
+        return definitions.get(func_name)
 
     def normalize_code(self, code: str) -> str:
         """
         Normalize code for comparison.
 
+        Parses the code and unparses it with docstrings, annotations and
+        the 'now' test parameter and its setup removed, so comments and
+        formatting drop out too. Code that does not parse falls back to
+        line-based stripping.
+        """
+        normalized = _normalize_ast(code)
+        if normalized is None:
+            return self._normalize_text(code)
+        return normalized
+
+    def _normalize_text(self, code: str) -> str:
+        """
+        Line-based normalization for code that does not parse.
+
         Removes:
         - Comments
         - Blank lines
@@ -156,14 +345,6 @@ class SyncVerifier:
             if stripped.startswith('#'):
                 continue
 
-            # Remove inline comments
-            if '#' in line and not stripped.startswith('#'):
-                parts = line.split('#')
-                if len(parts) > 1:
-                    before_hash = parts[0]
-                    if before_hash.count('"') % 2 == 0 and before_hash.count("'") % 2 == 0:
-                        line = before_hash.rstrip()
-
             # Skip lines that are just type hint imports or type definitions
             if stripped.startswith('from typing import'):
                 continue
@@ -172,13 +353,16 @@ class SyncVerifier:
 
         result = '\n'.join(lines)
 
+        # Remove inline comments
+        result = _INLINE_COMMENT_RE.sub(r'\1', result)
+
         # Remove type hints from function signatures
         # e.g., "def foo(x: str) -> int:" becomes "def foo(x):"
-        result = re.sub(r': [A-Za-z\[\], ]+(?=[,\)])', '', result)
-        result = re.sub(r' -> [A-Za-z\[\], ]+:', ':', result)
+        result = _TYPE_HINT_RE.sub('', result)
+        result = _RETURN_HINT_RE.sub(':', result)
 
         # Remove Optional wrapper
-        result = re.sub(r'Optional\[([^\]]+)\]', r'\1', result)
+        result = _OPTIONAL_RE.sub(r'\1', result)
 
         return result
 
@@ -187,8 +371,21 @@ class SyncVerifier:
         Extract just the body of a function, skipping signature and initial setup.
 
         This allows the module to have extra testability features (like 'now' param)
-        while still verifying the core logic matches.
+        while still verifying the core logic matches. The body is read from
+        the AST (docstring dropped, unparsed); source that does not parse
+        is handled line by line.
         """
+        try:
+            tree = ast.parse(textwrap.dedent(func_source))
+        except SyntaxError:
+            tree = None
+        if tree and tree.body and isinstance(tree.body[0], ast.FunctionDef):
+            fn = _Normalizer().visit(tree.body[0])
+            return ast.unparse(ast.Module(body=fn.body, type_ignores=[]))
+        return self._extract_body_lines(func_source)
+
+    def _extract_body_lines(self, func_source: str) -> str:
+        """Line-based extract_function_body for source that does not parse."""
         lines = func_source.split('\n')
         body_lines = []
         past_signature = False
@@ -212,7 +409,7 @@ class SyncVerifier:
                     paren_depth += stripped.count('(') - stripped.count(')')
 
                     # Check if signature ends on this line
-                    if paren_depth <= 0 and '):' in stripped or ') ->' in stripped:
+                    if paren_depth <= 0 and ('):' in stripped or ') ->' in stripped):
                         past_signature = True
                     continue
 
@@ -226,6 +423,13 @@ class SyncVerifier:
 
         return '\n'.join(body_lines)
 
+    def _normalize_function(self, func_source: str) -> str:
+        """Normalize a whole function, or just its body if it won't parse."""
+        normalized = _normalize_ast(func_source)
+        if normalized is None:
+            return self._normalize_text(self.extract_function_body(func_source))
+        return normalized
+
     def compare_functions(
         self,
         embedded_source: str,
@@ -253,17 +457,31 @@ class SyncVerifier:
         module_func = self.extract_function(module_source, func_name)
 
         if embedded_func is None:
-            return False, [f"Function '{func_name}' not found in cc_usage.sh"]
+            return False, [f"'{func_name}' not found in cc_usage.sh"]
 
         if module_func is None:
-            return False, [f"Function '{func_name}' not found in parser_extracted.py"]
+            return False, [f"'{func_name}' not found in parser_extracted.py"]
 
-        # Extract and normalize function bodies for comparison
-        embedded_body = self.extract_function_body(embedded_func)
-        module_body = self.extract_function_body(module_func)
+        # Unchanged sources come back as the same cached strings, so this
+        # check is usually an identity comparison
+        cached = self._compare_cache.get(func_name)
+        if cached and cached[0] == embedded_func and cached[1] == module_func:
+            is_same, diff = cached[2]
+            return is_same, list(diff)
 
-        embedded_norm = self.normalize_code(embedded_body)
-        module_norm = self.normalize_code(module_body)
+        result = self._compare_sources(embedded_func, module_func, func_name)
+        self._compare_cache[func_name] = (embedded_func, module_func, result)
+        return result[0], list(result[1])
+
+    def _compare_sources(
+        self,
+        embedded_func: str,
+        module_func: str,
+        func_name: str
+    ) -> Tuple[bool, List[str]]:
+        """Normalize and diff two extracted versions of a function."""
+        embedded_norm = self._normalize_function(embedded_func)
+        module_norm = self._normalize_function(module_func)
 
         if embedded_norm == module_norm:
             return True, []
@@ -279,13 +497,36 @@ class SyncVerifier:
 
         return False, diff
 
+    def _stat_key(self) -> tuple:
+        """Identify the current on-disk version of both files."""
+        key = []
+        for path in (self.script_path, self.module_path):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                key.append(None)
+            else:
+                key.append((st.st_mtime_ns, st.st_size))
+        return tuple(key)
+
     def verify(self) -> SyncStatus:
         """
         Verify that parser_extracted.py is in sync with cc_usage.sh.
 
+        The result is reused until either file is rewritten.
+
         Returns:
             SyncStatus with detailed results
         """
+        key = self._stat_key()
+        status = self._verify_cache.get(key)
+        if status is None:
+            status = self._verify_uncached()
+            self._verify_cache = {key: status}
+        return status
+
+    def _verify_uncached(self) -> SyncStatus:
+        """Run the full extraction and comparison behind verify()."""
         # Extract embedded Python
         embedded = self.extract_embedded_python()
         if embedded is None:
@@ -298,7 +539,8 @@ class SyncVerifier:
             )
 
         # Read module
-        if not self.module_path.exists():
+        module_source = self._read_cached(self.module_path)
+        if module_source is None:
             return SyncStatus(
                 in_sync=False,
                 differences=[],
@@ -307,13 +549,11 @@ class SyncVerifier:
                 message="parser_extracted.py not found"
             )
 
-        module_source = self.module_path.read_text()
-
-        # Compare each function
+        # Compare each function and constant
         all_differences = []
         out_of_sync_funcs = []
 
-        for func_name in self.SYNC_FUNCTIONS:
+        for func_name in self.SYNC_FUNCTIONS + self.SYNC_CONSTANTS:
             is_same, diff = self.compare_functions(embedded, module_source, func_name)
             if not is_same:
                 out_of_sync_funcs.append(func_name)
@@ -326,7 +566,7 @@ class SyncVerifier:
                 differences=all_differences,
                 extracted_line_count=len(embedded.split('\n')),
                 module_line_count=len(module_source.split('\n')),
-                message=f"Functions out of sync: {', '.join(out_of_sync_funcs)}"
+                message=f"Out of sync: {', '.join(out_of_sync_funcs)}"
             )
 
         return SyncStatus(
@@ -334,7 +574,7 @@ class SyncVerifier:
             differences=[],
             extracted_line_count=len(embedded.split('\n')),
             module_line_count=len(module_source.split('\n')),
-            message="All functions in sync"
+            message="All functions and constants in sync"
         )
 
     def auto_sync(self, dry_run: bool = False) -> Tuple[bool, str]:
@@ -355,14 +595,14 @@ class SyncVerifier:
         if embedded is None:
             return False, "Could not extract Python from cc_usage.sh"
 
-        if not self.module_path.exists():
+        module_source = self._read_cached(self.module_path)
+        if module_source is None:
             return False, "parser_extracted.py not found"
 
-        module_source = self.module_path.read_text()
         updated_source = module_source
 
         changes = []
-        for func_name in self.SYNC_FUNCTIONS:
+        for func_name in self.SYNC_FUNCTIONS + self.SYNC_CONSTANTS:
             embedded_func = self.extract_function(embedded, func_name)
             if embedded_func is None:
                 continue
@@ -396,6 +636,11 @@ class SyncVerifier:
         return False, f"Functions need manual sync: {', '.join(changes)}"
 
 
+@functools.lru_cache(maxsize=1)
+def _default_verifier() -> SyncVerifier:
+    return SyncVerifier()
+
+
 def verify_sync() -> SyncStatus:
     """Convenience function for quick sync verification."""
-    return SyncVerifier().verify()
+    return _default_verifier().verify()
@@ -5,7 +5,10 @@ Unit tests for date/time parsing (parse_reset_time and clean_date_string).
 import pytest
 import datetime
 from datetime import timedelta
-from tests.parser_extracted import parse_reset_time, clean_date_string, validate_reset_time, cross_validate_reset
+from tests.parser_extracted import (
+    parse_reset_time, clean_date_string, validate_reset_time, cross_validate_reset,
+    check_reset_time,
+)
 
 
 class TestCleanDateString:
@@ -66,7 +69,7 @@ class TestCleanDateString:
 class TestParseResetTime:
     """Tests for the parse_reset_time function."""
 
-    @pytest.fixture
+    @pytest.fixture(scope="session")
     def base_time(self):
         """Base time for testing: Jan 28, 2026 at 2:30pm."""
         return datetime.datetime(2026, 1, 28, 14, 30, 0)
@@ -240,6 +243,15 @@ class TestParseResetTime:
         assert result.hour == 18
         assert result.minute == 59
 
+    @pytest.mark.parametrize("time_str", [
+        pytest.param("٦:٥٩pm", id="time_only"),
+        pytest.param("Jan ٢٩ at 6:59pm", id="date_digits"),
+        pytest.param("Jan 29 at ٦:٥٩pm", id="time_digits"),
+    ])
+    def test_non_ascii_digits(self, base_time, time_str):
+        """strptime's %d/%I take ASCII digits only, so other digits don't parse."""
+        assert parse_reset_time(time_str, window_hours=168, now=base_time) is None
+
     def test_with_section_text_extraction(self, base_time):
         """Extract time from section text when direct string is corrupted."""
         corrupted_str = "6:  59pm"  # Corrupted by terminal rendering
@@ -307,6 +319,28 @@ class TestParseResetTime:
         assert result.hour == 18
         assert result.minute == 59
 
+    def test_section_end_limits_fallback_search(self, base_time):
+        """section_end should behave like slicing section_text at that index."""
+        section_text = "Resets 6:59pm\nCurrent week (all models)\nResets 1:00am"
+        section_end = section_text.find("Current week")
+
+        result = parse_reset_time(
+            "corrupted",
+            window_hours=5,
+            section_text=section_text,
+            now=base_time,
+            section_end=section_end
+        )
+        assert result is not None
+        assert result.hour == 18
+        assert result.minute == 59
+
+    def test_now_stays_fourth_positional(self, base_time):
+        """section_end is keyword-only, so a positional now still means now."""
+        result = parse_reset_time("1:00am", 5, "Resets 6:59pm", base_time)
+
+        assert result == datetime.datetime(2026, 1, 28, 18, 59)
+
     def test_invalid_string_returns_none(self, base_time):
         """Completely invalid string should return None."""
         result = parse_reset_time("not a time", window_hours=5, now=base_time)
@@ -321,7 +355,7 @@ class TestParseResetTime:
 class TestValidateResetTime:
     """Tests for the validate_reset_time function."""
 
-    @pytest.fixture
+    @pytest.fixture(scope="session")
     def base_time(self):
         """Base time for testing."""
         return datetime.datetime(2026, 1, 28, 14, 30, 0)
@@ -464,7 +498,7 @@ class TestPastDateHandling:
 class TestCrossValidation:
     """Tests for the cross_validate_reset function."""
 
-    @pytest.fixture
+    @pytest.fixture(scope="session")
     def base_time(self):
         return datetime.datetime(2026, 1, 30, 11, 47, 0)
 
@@ -510,3 +544,44 @@ class TestCrossValidation:
         reset_dt = base_time + timedelta(hours=168, minutes=1)
         warning = cross_validate_reset(reset_dt, 168, "test", now=base_time)
         assert warning is not None
+
+    # Outcomes of the original validate_reset_time followed by
+    # cross_validate_reset on its result, which check_reset_time fuses
+    @pytest.mark.parametrize("offset, window_hours, kept, warning, cross_warning", [
+        pytest.param(timedelta(hours=3), 5, True, None, None, id="valid_session"),
+        pytest.param(
+            timedelta(hours=5, minutes=30), 5, True, None,
+            "Inconsistent: 'test' → 5.5h remaining (expected ≤5h)",
+            id="inside_buffer",
+        ),
+        pytest.param(
+            timedelta(minutes=-10), 5, True, None,
+            "Inconsistent: 'test' → -0.2h remaining (expected ≥0)",
+            id="just_past",
+        ),
+        pytest.param(
+            timedelta(hours=200), 168, False,
+            "Invalid: 200.0h remaining exceeds 168h window", None,
+            id="exceeds_window",
+        ),
+        pytest.param(
+            timedelta(hours=-200), 168, False,
+            "Invalid: reset time -200.0h in past", None,
+            id="far_past",
+        ),
+    ])
+    def test_check_reset_time_outcomes(
+        self, base_time, offset, window_hours, kept, warning, cross_warning
+    ):
+        """The fused check gives the original two-step outcomes."""
+        reset_dt = base_time + offset
+
+        assert check_reset_time(reset_dt, window_hours, "test", now=base_time) == (
+            reset_dt if kept else None, warning, cross_warning
+        )
+
+    def test_check_reset_time_none_input(self, base_time):
+        """A failed parse gets the parse warning and no cross warning."""
+        assert check_reset_time(None, 5, "garbage", now=base_time) == (
+            None, "Failed to parse: 'garbage'", None
+        )
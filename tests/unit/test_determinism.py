@@ -7,85 +7,115 @@ different results on repeated invocations with the same input.
 
 import pytest
 import datetime
-from tests.parser_extracted import parse_reset_time, cross_validate_reset
+from tests.parser_extracted import (
+    _reset_time_components, parse_reset_time, cross_validate_reset,
+    extract_usage_data,
+)
+
+SECTION_TEXT = """
+        Current week (all models)
+        ████████████████░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░  10% used
+        Resets Feb 5 at 7pm (Europe/Stockholm)
+        """
 
 
 class TestParsingDeterminism:
     """Tests that verify parsing produces consistent results."""
 
-    @pytest.fixture
+    @pytest.fixture(scope="session")
     def base_time(self):
         """Base time for testing: Jan 30, 2026 at 11:47am."""
         return datetime.datetime(2026, 1, 30, 11, 47, 0)
 
-    def test_time_only_determinism(self, base_time):
-        """Time-only input should always produce same output."""
-        test_input = "6:59pm"
-        results = [
-            parse_reset_time(test_input, window_hours=5, now=base_time)
-            for _ in range(10)
-        ]
-        assert len(set(results)) == 1, f"Non-deterministic results: {set(results)}"
-
-    def test_date_time_determinism(self, base_time):
-        """Date+time input should always produce same output."""
-        test_input = "Feb 5 at 7pm"
-        results = [
-            parse_reset_time(test_input, window_hours=168, now=base_time)
-            for _ in range(10)
-        ]
-        assert len(set(results)) == 1, f"Non-deterministic results: {set(results)}"
-
-    def test_date_time_with_timezone_determinism(self, base_time):
-        """Date+time with timezone should always produce same output."""
-        test_input = "Feb 5 at 7pm (Europe/Stockholm)"
-        results = [
-            parse_reset_time(test_input, window_hours=168, now=base_time)
-            for _ in range(10)
-        ]
-        assert len(set(results)) == 1, f"Non-deterministic results: {set(results)}"
-
-    def test_section_text_extraction_determinism(self, base_time):
-        """Extraction from section text should be deterministic."""
-        section_text = """
-        Current week (all models)
-        ████████████████░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░  10% used
-        Resets Feb 5 at 7pm (Europe/Stockholm)
-        """
-        results = [
-            parse_reset_time("corrupted", window_hours=168, section_text=section_text, now=base_time)
-            for _ in range(10)
-        ]
-        assert len(set(results)) == 1, f"Non-deterministic results: {set(results)}"
-
-    def test_weekly_tomorrow_logic_determinism(self, base_time):
-        """Weekly 'tomorrow' logic should be deterministic."""
+    @staticmethod
+    def _parse_repeatedly(times, *args, **kwargs):
+        """Parse once from a cold cache, then from a warm cache."""
+        _reset_time_components.cache_clear()
+        return [parse_reset_time(*args, **kwargs) for _ in range(times)]
+
+    @pytest.mark.parametrize("test_input, window_hours, section_text", [
+        pytest.param("6:59pm", 5, None, id="time_only"),
+        pytest.param("Feb 5 at 7pm", 168, None, id="date_time"),
+        pytest.param("Feb 5 at 7pm (Europe/Stockholm)", 168, None,
+                     id="date_time_with_timezone"),
+        pytest.param("corrupted", 168, SECTION_TEXT, id="section_text_extraction"),
         # At 11:47am, 9:00am is in the past - should advance to tomorrow
-        test_input = "9:00am"
-        results = [
-            parse_reset_time(test_input, window_hours=168, now=base_time)
-            for _ in range(10)
-        ]
+        pytest.param("9:00am", 168, None, id="weekly_tomorrow_logic"),
+    ])
+    def test_parsing_determinism(self, base_time, test_input, window_hours, section_text):
+        """The same input should always produce the same output."""
+        results = self._parse_repeatedly(
+            2, test_input, window_hours=window_hours,
+            section_text=section_text, now=base_time,
+        )
         assert len(set(results)) == 1, f"Non-deterministic results: {set(results)}"
 
     def test_year_wrap_determinism(self):
         """Year wrap logic should be deterministic."""
         # In December, seeing January date should be next year
         dec_time = datetime.datetime(2025, 12, 20, 12, 0, 0)
-        test_input = "Jan 5 at 6pm"
-        results = [
-            parse_reset_time(test_input, window_hours=168, now=dec_time)
-            for _ in range(10)
-        ]
+        results = self._parse_repeatedly(2, "Jan 5 at 6pm", window_hours=168, now=dec_time)
         assert len(set(results)) == 1, f"Non-deterministic results: {set(results)}"
         # And should all be 2026
         assert all(r.year == 2026 for r in results if r is not None)
 
+    @pytest.mark.parametrize("time_str, nows, expected", [
+        # 6:59pm is tomorrow once now is more than 15 minutes past it
+        pytest.param(
+            "6:59pm",
+            [datetime.datetime(2026, 1, 30, 11, 47), datetime.datetime(2026, 1, 30, 20, 0)],
+            [datetime.datetime(2026, 1, 30, 18, 59), datetime.datetime(2026, 1, 31, 18, 59)],
+            id="tomorrow_logic",
+        ),
+        # The year of a yearless date follows now, including the wrap
+        pytest.param(
+            "Jan 5 at 6pm",
+            [datetime.datetime(2026, 1, 3, 12, 0), datetime.datetime(2026, 12, 20, 12, 0)],
+            [datetime.datetime(2026, 1, 5, 18, 0), datetime.datetime(2027, 1, 5, 18, 0)],
+            id="year_wrap",
+        ),
+    ])
+    def test_cached_parse_follows_now(self, time_str, nows, expected):
+        """A warm cache must not pin the result to the first call's now."""
+        _reset_time_components.cache_clear()
+        results = [
+            parse_reset_time(time_str, window_hours=168, now=now) for now in nows
+        ]
+        assert results == expected
+
+    def test_results_do_not_share_warnings(self):
+        """Repeated parses return independent ParseResults, warnings included."""
+        content = """
+Current session
+██████  42% used
+Resets soon
+
+Current week (all models)
+████  23% used
+Resets Jan 29 at 6:59pm
+"""
+        first = extract_usage_data(content)
+        second = extract_usage_data(content)
+
+        assert first.warnings and first.warnings == second.warnings
+        first.warnings.append("mutated")
+        assert "mutated" not in second.warnings
+        assert "mutated" not in extract_usage_data(content).warnings
+
+    @pytest.mark.slow
+    def test_repeated_parsing_stress(self, base_time):
+        """Full verification: ten repeated parses agree."""
+        results = self._parse_repeatedly(
+            10, "Feb 5 at 7pm (Europe/Stockholm)", window_hours=168, now=base_time,
+        )
+        assert results[0] is not None
+        assert len(set(results)) == 1, f"Non-deterministic results: {set(results)}"
+
 
 class TestCrossValidationDeterminism:
     """Tests that cross-validation is deterministic."""
 
-    @pytest.fixture
+    @pytest.fixture(scope="session")
     def base_time(self):
         return datetime.datetime(2026, 1, 30, 11, 47, 0)
 
@@ -94,7 +124,7 @@ class TestCrossValidationDeterminism:
         reset_dt = datetime.datetime(2026, 2, 5, 19, 0, 0)  # Feb 5 at 7pm
         results = [
             cross_validate_reset(reset_dt, 168, "Feb 5 at 7pm", now=base_time)
-            for _ in range(10)
+            for _ in range(2)
         ]
         # All should be None (valid)
         assert all(r is None for r in results)
@@ -105,7 +135,7 @@ class TestCrossValidationDeterminism:
         reset_dt = datetime.datetime(2026, 1, 29, 19, 0, 0)  # Yesterday
         results = [
             cross_validate_reset(reset_dt, 168, "Jan 29 at 7pm", now=base_time)
-            for _ in range(10)
+            for _ in range(2)
         ]
         # All should have same warning
         assert len(set(results)) == 1
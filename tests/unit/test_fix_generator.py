@@ -0,0 +1,121 @@
+"""
+Tests for the self-healing fix templates against the real parser source.
+"""
+
+import datetime
+from pathlib import Path
+
+import pytest
+from tests.self_heal.analyzer import RootCause
+from tests.self_heal.code_modifier import CodeModifier
+from tests.self_heal.fix_generator import FixGenerator
+
+
+PARSER_PATH = Path(__file__).parent.parent / "parser_extracted.py"
+
+
+@pytest.fixture(scope="module")
+def generator():
+    """FixGenerator reading the real parser source."""
+    return FixGenerator(parser_path=PARSER_PATH)
+
+
+@pytest.fixture(scope="module")
+def modifier(tmp_path_factory):
+    """CodeModifier whose rollback directory is kept out of the repo."""
+    return CodeModifier(project_root=tmp_path_factory.mktemp("project"))
+
+
+def _root_cause(fix_type, **context):
+    """RootCause asking for fix_type, with the given analysis context."""
+    return RootCause(
+        failure=None,
+        description="test",
+        affected_function="",
+        affected_lines=[],
+        suggested_fix_type=fix_type,
+        context=context,
+    )
+
+
+class TestApplyDiff:
+    """Tests for CodeModifier._apply_diff on generated fixes."""
+
+    def test_every_line_pair_is_applied(self, generator, modifier):
+        """A template changing two lines changes both, not just the first."""
+        fix, = generator.generate_fixes(_root_cause("broaden_regex", is_week=True))
+        source = PARSER_PATH.read_text()
+
+        new_source = modifier._apply_diff(source, fix)
+
+        assert "Current\\s+week\\s*\\(all" in new_source
+        assert "re.compile(r'Resets\\s*(.*?)(?:\\s+|\\n|$)'" in new_source
+
+    def test_missing_line_fails_whole_diff(self, generator, modifier):
+        """If any removed line isn't found, nothing is applied."""
+        fix, = generator.generate_fixes(_root_cause("broaden_regex", is_week=True))
+        source = PARSER_PATH.read_text().replace(
+            "re.compile(r'Resets\\s*(.*?)", "re.compile(r'Resets\\s+(.*?)"
+        )
+
+        assert modifier._apply_diff(source, fix) is None
+
+
+def _load(source):
+    """Execute parser source as a fresh module namespace."""
+    namespace = {"__name__": "patched_parser"}
+    exec(compile(source, str(PARSER_PATH), "exec"), namespace)
+    return namespace
+
+
+class TestTemplates:
+    """The templated fixes change the code paths they are meant for."""
+
+    def test_every_template_applies(self, generator, modifier):
+        """Every non-AI fix strategy produces a change to the real parser."""
+        source = PARSER_PATH.read_text()
+        # Context that makes each strategy offer all of its candidates
+        context = {
+            "date_string": "29 Jan at 18:59",
+            "inferred_format": "%d %b at %H:%M",
+            "is_session": True,
+            "is_week": True,
+            "is_window_exceeded": True,
+            "is_in_past": True,
+        }
+
+        applied = 0
+        for fix_type in generator._generators:
+            if fix_type == "ai_diagnose":
+                continue
+            for fix in generator.generate_fixes(_root_cause(fix_type, **context)):
+                new_source = modifier._apply_diff(source, fix)
+                assert new_source is not None, f"{fix_type}: {fix.description}"
+                assert new_source != source, f"{fix_type}: {fix.description}"
+                compile(new_source, str(PARSER_PATH), "exec")
+                applied += 1
+
+        # 3 format lists, 2 regexes, 2 thresholds, ANSI, midnight, year wrap
+        assert applied == 10
+
+    def test_midnight_fix_reaches_time_only_path(self, generator, modifier):
+        """The tomorrow logic lives in one place, used by decoded times too."""
+        fix, = generator.generate_fixes(_root_cause("fix_midnight_logic"))
+        patched = _load(modifier._apply_diff(PARSER_PATH.read_text(), fix))
+        now = datetime.datetime(2026, 1, 28, 14, 30)
+
+        # 20 minutes ago: past the original 15 minute grace, inside 30
+        result = patched["parse_reset_time"]("2:10pm", 5, None, now)
+
+        assert result == datetime.datetime(2026, 1, 28, 14, 10)
+
+    def test_year_wrap_fix_widens_past_threshold(self, generator, modifier):
+        """Only the "next year" threshold moves, as in the original template."""
+        fix, = generator.generate_fixes(_root_cause("fix_year_wrap"))
+        patched = _load(modifier._apply_diff(PARSER_PATH.read_text(), fix))
+        now = datetime.datetime(2026, 12, 30, 12, 0)
+
+        # 310 days back: next year's before the fix, this year's after it
+        result = patched["parse_reset_time"]("Feb 23 at 12pm", 168, None, now)
+
+        assert result == datetime.datetime(2026, 2, 23, 12, 0)
@@ -9,10 +9,22 @@ import pytest
 from tests.self_heal.sync_verifier import SyncVerifier, verify_sync
 
 
+@pytest.fixture(scope="session")
+def verifier():
+    """One SyncVerifier for the session; it caches file reads and parsing."""
+    return SyncVerifier()
+
+
+@pytest.fixture(scope="session")
+def sync_status():
+    """Result of verify_sync(), computed once per session."""
+    return verify_sync()
+
+
 class TestSyncVerifier:
     """Tests for the sync verifier."""
 
-    def test_sync_status(self):
+    def test_sync_status(self, sync_status):
         """
         CRITICAL: Verify parser_extracted.py matches cc_usage.sh.
 
@@ -23,7 +35,7 @@ class TestSyncVerifier:
         To fix: Update parser_extracted.py to match the embedded Python
         in cc_usage.sh, or vice versa.
         """
-        status = verify_sync()
+        status = sync_status
 
         if not status.in_sync:
             # Print detailed diff for debugging
@@ -44,9 +56,8 @@ class TestSyncVerifier:
             f"actually runs. Fix the divergence before proceeding."
         )
 
-    def test_extract_embedded_python(self):
+    def test_extract_embedded_python(self, verifier):
         """Verify we can extract Python from cc_usage.sh."""
-        verifier = SyncVerifier()
         embedded = verifier.extract_embedded_python()
 
         assert embedded is not None, "Failed to extract embedded Python"
@@ -54,10 +65,8 @@ class TestSyncVerifier:
         assert "def parse_reset_time" in embedded
         assert "def validate_reset_time" in embedded
 
-    def test_extract_function(self):
+    def test_extract_function(self, verifier):
         """Test function extraction from source code."""
-        verifier = SyncVerifier()
-
         source = '''
 def foo(x):
     return x + 1
@@ -70,10 +79,8 @@ def bar(y):
         assert 'return x + 1' in foo_func
         assert 'bar' not in foo_func
 
-    def test_normalize_code(self):
+    def test_normalize_code(self, verifier):
         """Test code normalization."""
-        verifier = SyncVerifier()
-
         code = '''
 def foo():
     # This is a comment
@@ -86,3 +93,97 @@ def foo():
         # Comments and blank lines should be removed
         assert '# This is a comment' not in normalized
         assert 'x = 1' in normalized
+
+    def test_normalize_code_keeps_hash_in_strings(self, verifier):
+        """A '#' inside a string literal does not start a comment."""
+        normalized = verifier.normalize_code('x = "a#b"  # note\ny = \'#\'')
+
+        assert normalized == verifier.normalize_code("x = 'a#b'\ny = '#'")
+        assert 'note' not in normalized
+
+    def test_normalize_code_ignores_now_parameter(self, verifier):
+        """The module's optional 'now' parameter and its setup are dropped."""
+        embedded = '''
+def check(reset_dt, window_hours):
+    now = datetime.datetime.now()
+    return reset_dt - now
+'''
+        module = '''
+def check(
+    reset_dt: datetime.datetime,
+    window_hours: int,
+    now: Optional[datetime.datetime] = None,
+) -> datetime.timedelta:
+    """Docstring."""
+    if now is None:
+        now = datetime.datetime.now()
+    return reset_dt - now
+'''
+        assert verifier.normalize_code(embedded) == verifier.normalize_code(module)
+
+    def test_now_before_other_parameters_is_a_difference(self, verifier):
+        """Only a trailing defaulted 'now' is ignored, so reordering is caught."""
+        embedded = "def f(x, end=None, now=None):\n    return x\n"
+        module = "def f(x, now=None, end=None):\n    return x\n"
+
+        is_same, diff = verifier.compare_functions(embedded, module, 'f')
+
+        assert not is_same
+
+    def test_decorators_are_compared(self, verifier):
+        """A decorator on only one copy (e.g. lru_cache) is out of sync."""
+        embedded = "@functools.lru_cache(maxsize=None)\ndef g(x):\n    return x\n"
+        module = "def g(x):\n    return x\n"
+
+        is_same, diff = verifier.compare_functions(embedded, module, 'g')
+
+        assert not is_same
+        assert '-@functools.lru_cache(maxsize=None)' in diff
+
+    def test_verify_reuses_result_until_file_changes(self, tmp_path):
+        """verify() is cached on the files' mtime/size and re-runs after edits."""
+        defaults = SyncVerifier()
+        script = tmp_path / "cc_usage.sh"
+        module = tmp_path / "parser_extracted.py"
+        script.write_text(defaults.script_path.read_text())
+        module.write_text(defaults.module_path.read_text())
+
+        verifier = SyncVerifier(script_path=script, module_path=module)
+        first = verifier.verify()
+        assert first.in_sync
+        assert verifier.verify() is first
+
+        module.write_text(module.read_text().replace(
+            "def strip_ansi(text: str) -> str:\n",
+            "def strip_ansi(text: str) -> str:\n    text = text.strip()\n",
+        ))
+        assert not verifier.verify().in_sync
+
+    def test_constant_change_is_out_of_sync(self, tmp_path):
+        """Module-level patterns and constants are compared, not just functions."""
+        defaults = SyncVerifier()
+        script = tmp_path / "cc_usage.sh"
+        module = tmp_path / "parser_extracted.py"
+        script.write_text(defaults.script_path.read_text())
+        module.write_text(defaults.module_path.read_text().replace(
+            "_RESET_GRACE = timedelta(minutes=15)",
+            "_RESET_GRACE = timedelta(minutes=30)",
+        ))
+
+        status = SyncVerifier(script_path=script, module_path=module).verify()
+
+        assert not status.in_sync
+        assert status.message == "Out of sync: _RESET_GRACE"
+        assert '+_RESET_GRACE = timedelta(minutes=30)' in status.differences
+
+    def test_compare_functions_diff_shows_changed_line(self, verifier):
+        """Out-of-sync functions report a unified diff of the changed line."""
+        embedded = "def f(x):\n    if x:\n        return None\n    return x + 1\n"
+        module = "def f(x):\n    if x:\n        return None\n    return x + 2\n"
+
+        is_same, diff = verifier.compare_functions(embedded, module, 'f')
+
+        assert not is_same
+        assert diff[:2] == ['--- cc_usage.sh:f', '+++ parser_extracted.py:f']
+        assert '-    return x + 1' in diff
+        assert '+    return x + 2' in diff